@@ -2,7 +2,15 @@ import yaml
 import sys
 import os
 
-def validate_dependencies(file_path):
+def load_dependencies(file_path):
+    with open(file_path, 'r') as f:
+        return {dep.lower() for dep in (yaml.safe_load(f) or [])}
+
+def validate_dependencies(file_path, dependencies_path=None):
+    """
+    Validate a list of services. If dependencies_path is given, every service must
+    also be listed there, e.g. a task can only mutate services it depends on.
+    """
     with open(file_path, 'r') as f:
         try:
             data = yaml.safe_load(f)
@@ -20,22 +28,30 @@ def validate_dependencies(file_path):
                 if dep.lower() not in valid_deps:
                     print(f'Error: Invalid dependency {dep} in {file_path}')
                     return False
+            if dependencies_path is not None:
+                undeclared = {dep.lower() for dep in data} - load_dependencies(dependencies_path)
+                if undeclared:
+                    print(f'Error: {", ".join(sorted(undeclared))} in {file_path} not listed in {dependencies_path}')
+                    return False
         except yaml.YAMLError:
             print(f'Error: {file_path} is not a valid YAML file')
             return False
     return True
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
+    if len(sys.argv) not in (2, 3):
         print("Usage: python validate_dependencies.py <path_to_dependencies.yml>")
+        print("       python validate_dependencies.py <path_to_mutations.yml> <path_to_dependencies.yml>")
         sys.exit(1)
     
     file_path = sys.argv[1]
-    if not os.path.exists(file_path):
-        print(f"Error: File {file_path} does not exist")
-        sys.exit(1)
+    dependencies_path = sys.argv[2] if len(sys.argv) == 3 else None
+    for path in [file_path, dependencies_path]:
+        if path is not None and not os.path.exists(path):
+            print(f"Error: File {path} does not exist")
+            sys.exit(1)
     
-    if validate_dependencies(file_path):
+    if validate_dependencies(file_path, dependencies_path):
         print(f"Dependencies in {file_path} are valid")
         sys.exit(0)
     else:
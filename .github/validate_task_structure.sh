@@ -91,6 +91,11 @@ for task_dir in *; do
 
   poetry run python ../../../.github/validate_dependencies.py "dependencies.yml"
 
+  # 7. Check mutations.yml (optional), which may only list services from dependencies.yml
+  if [ -f "mutations.yml" ]; then
+    poetry run python ../../../.github/validate_dependencies.py "mutations.yml" "dependencies.yml"
+  fi
+
   cd -
 done
 
@@ -83,9 +83,15 @@ def load_dependencies(runtime: Runtime) -> List[str]:
     return dependencies
 
 
-def init_task_env(runtime: Runtime, hostname: str, env_llm_config: LLMConfig):
+def init_task_env(runtime: Runtime, hostname: str, env_llm_config: LLMConfig,
+                  skip_reset_services: List[str] | None = None):
+    """
+    Run init.sh in the task container. Services listed in skip_reset_services are
+    known to be in a clean state already, so reset.sh only health-checks them.
+    """
     command = (
         f"SERVER_HOSTNAME={hostname} "
+        f"SKIP_RESET_SERVICES={','.join(skip_reset_services or [])} "
         f"LITELLM_API_KEY={env_llm_config.api_key.get_secret_value() if env_llm_config.api_key else None} "
         f"LITELLM_BASE_URL={env_llm_config.base_url} "
         f"LITELLM_MODEL={env_llm_config.model} "
@@ -160,13 +166,23 @@ def run_solver(runtime: Runtime, task_name: str, config: AppConfig, dependencies
     return state
 
 
-def run_evaluator(runtime: Runtime, env_llm_config: LLMConfig, trajectory_path: str, result_path: str):
+def run_evaluator(runtime: Runtime, env_llm_config: LLMConfig, trajectory_path: str, result_path: str,
+                  llm_cache_path: str = None, collect_metrics: bool = False):
+    """
+    Run the task evaluator in the runtime container. If llm_cache_path (a path in
+    the runtime container) is given, LLM responses are cached there, so that
+    re-evaluating the same outputs doesn't query the LLM again. If collect_metrics
+    is set, the result contains the wall time, HTTP and LLM usage of each grader.
+    """
+    llm_cache_env = f"LLM_CACHE_PATH={llm_cache_path} " if llm_cache_path else ""
     command = (
         f"LITELLM_API_KEY={env_llm_config.api_key.get_secret_value() if env_llm_config.api_key else None} "
         f"LITELLM_BASE_URL={env_llm_config.base_url} "
         f"LITELLM_MODEL={env_llm_config.model} "
+        f"{llm_cache_env}"
         f"DECRYPTION_KEY='theagentcompany is all you need' "  # Hardcoded Key
         f"python_default /utils/eval.py --trajectory_path {trajectory_path} --result_path {result_path}"
+        f"{' --metrics' if collect_metrics else ''}"
     )
     action = CmdRunAction(command=command)
     action.set_hard_timeout(600)
@@ -209,6 +225,11 @@ if __name__ == '__main__':
         default=None,
         help='LLM config for evaluation environment (NPC & llm-based evaluator)',
     )
+    parser.add_argument(
+        '--eval-metrics',
+        action='store_true',
+        help='Record wall time, HTTP and LLM usage of each grader in the evaluation result',
+    )
     parser.add_argument(
         '--build-image-only',
         type=bool,
@@ -291,8 +312,16 @@ if __name__ == '__main__':
     trajectory_path = f'/outputs/traj_{task_short_name}.json'
     result_path = f'/outputs/eval_{task_short_name}.json'
 
-    run_evaluator(runtime, env_llm_config, trajectory_path, result_path)
+    # the LLM cache lives in the outputs path, and is made available to the evaluator via the mount path
+    llm_cache_file = f'llm_cache_{task_short_name}.sqlite'
+    if os.path.exists(os.path.join(os.path.abspath(args.outputs_path), llm_cache_file)):
+        shutil.copy(os.path.join(os.path.abspath(args.outputs_path), llm_cache_file), os.path.join(temp_dir, llm_cache_file))
+
+    run_evaluator(runtime, env_llm_config, trajectory_path, result_path,
+                  llm_cache_path=f'/outputs/{llm_cache_file}', collect_metrics=args.eval_metrics)
 
-    # finally, move trajectory file and evaluation result from mount path on host (temp dir) to outputs path
+    # finally, move trajectory file, evaluation result and LLM cache from mount path on host (temp dir) to outputs path
     shutil.move(os.path.join(temp_dir, f'traj_{task_short_name}.json'), os.path.join(os.path.abspath(args.outputs_path), f'traj_{task_short_name}.json'))
     shutil.move(os.path.join(temp_dir, f'eval_{task_short_name}.json'), os.path.join(os.path.abspath(args.outputs_path), f'eval_{task_short_name}.json'))
+    if os.path.exists(os.path.join(temp_dir, llm_cache_file)):
+        shutil.move(os.path.join(temp_dir, llm_cache_file), os.path.join(os.path.abspath(args.outputs_path), llm_cache_file))
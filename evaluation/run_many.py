@@ -0,0 +1,321 @@
+"""
+Run many tasks concurrently with a bounded worker pool.
+
+run_eval.sh evaluates tasks one at a time. This scheduler runs up to N tasks
+at once, each in its own worker process, through the same helpers used by
+run_eval.py. Every task resets the services listed in its dependencies.yml
+during initialization, so two tasks that depend on the same service are never
+scheduled at the same time. Tasks that already have an evaluation result in the
+outputs folder are skipped, which keeps the run resumable.
+
+With --batch-resets, tasks are grouped by their dependency set and the scheduler
+keeps track of which services are still in a clean state. A service is only
+reset if a previous task may have mutated it, as declared by the optional
+mutations.yml file of each task.
+"""
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Set
+
+import yaml
+
+from openhands.core.config import AppConfig, LLMConfig, get_llm_config_arg, get_parser
+from openhands.core.logger import openhands_logger as logger
+from openhands.core.main import create_runtime
+from openhands.runtime.base import Runtime
+from openhands.utils.async_utils import call_async_from_sync
+
+from browsing import pre_login
+from run_eval import get_config, init_task_env, load_dependencies, run_evaluator, run_solver
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TASKS_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'workspaces', 'tasks'))
+
+
+def read_task_dependencies(task_name: str) -> Set[str]:
+    """
+    Read the services a task depends on from its dependencies.yml on the host,
+    so that the scheduler knows them before the task container is started.
+    """
+    with open(os.path.join(TASKS_DIR, task_name, 'dependencies.yml'), 'r') as f:
+        dependencies = yaml.safe_load(f)
+    if dependencies is None:
+        return set()
+    return {dep.lower() for dep in dependencies}
+
+
+def read_task_mutations(task_name: str, dependencies: Set[str]) -> Set[str]:
+    """
+    Read the services a task mutates from its optional mutations.yml. If the
+    file is absent, the task is assumed to mutate all of its dependencies.
+    """
+    task_dir = os.path.join(TASKS_DIR, task_name)
+    mutations_file = os.path.join(task_dir, 'mutations.yml')
+    if not os.path.exists(mutations_file):
+        return set(dependencies)
+    with open(mutations_file, 'r') as f:
+        mutations = yaml.safe_load(f)
+    mutations = set() if mutations is None else {dep.lower() for dep in mutations}
+    # NPCs always talk to the examinee, which changes RocketChat state
+    if os.path.exists(os.path.join(task_dir, 'scenarios.json')) and 'rocketchat' in dependencies:
+        mutations.add('rocketchat')
+    return mutations & dependencies
+
+
+def order_for_batching(tasks: List[str], dependencies: Dict[str, Set[str]],
+                       mutations: Dict[str, Set[str]]) -> List[str]:
+    """
+    Put tasks with the same dependency set next to each other, and within each
+    group run read-only tasks first, so that they can share a single reset.
+    """
+    return sorted(tasks, key=lambda task: (sorted(dependencies[task]), len(mutations[task]), task))
+
+
+def load_llm_config(config_name: str, purpose: str) -> LLMConfig:
+    llm_config: LLMConfig | None = None
+    if config_name:
+        llm_config = get_llm_config_arg(config_name)
+
+    if llm_config is None:
+        raise ValueError(f'Could not find LLM config for {purpose}: {config_name}')
+
+    if llm_config.api_key is None:
+        raise ValueError(f'LLM API key is not set for {purpose}')
+    return llm_config
+
+
+def run_task(task_name: str, task_image: str, agent_llm_config_name: str,
+             env_llm_config_name: str, server_hostname: str, outputs_path: str,
+             skip_reset_services: List[str], eval_metrics: bool = False) -> Dict[str, float]:
+    """
+    Run a single task end-to-end in the current (worker) process and return
+    the time spent in each phase, in seconds.
+    """
+    timings: Dict[str, float] = {}
+    task_short_name = task_image.split('/')[-1].split(':')[0]
+    agent_llm_config = load_llm_config(agent_llm_config_name, 'agent')
+    env_llm_config = load_llm_config(env_llm_config_name, 'evaluation environment')
+
+    # every task gets its own mount directory so that concurrent tasks don't
+    # overwrite each other's trajectories and evaluation results
+    temp_dir = tempfile.mkdtemp(prefix=f'{task_short_name}-')
+    llm_cache_file = f'llm_cache_{task_short_name}.sqlite'
+    if os.path.exists(os.path.join(outputs_path, llm_cache_file)):
+        shutil.copy(os.path.join(outputs_path, llm_cache_file), os.path.join(temp_dir, llm_cache_file))
+
+    start = time.time()
+    config: AppConfig = get_config(task_image, task_short_name, temp_dir, agent_llm_config)
+    runtime: Runtime = create_runtime(config)
+    call_async_from_sync(runtime.connect)
+    timings['runtime'] = time.time() - start
+
+    try:
+        start = time.time()
+        init_task_env(runtime, server_hostname, env_llm_config, skip_reset_services)
+        dependencies = load_dependencies(runtime)
+        logger.info(f"Service dependencies of {task_name}: {dependencies}")
+
+        screenshots_dir = os.path.join(outputs_path, "screenshots")
+        try:
+            pre_login(runtime, dependencies, save_screenshots=True, screenshots_dir=screenshots_dir)
+        except Exception as e:
+            logger.error(f"Failed to pre-login: {e}")
+
+            # before giving up, let's try to init and login again
+            init_task_env(runtime, server_hostname, env_llm_config, skip_reset_services)
+            pre_login(runtime, dependencies, save_screenshots=True, screenshots_dir=screenshots_dir)
+        timings['init'] = time.time() - start
+
+        start = time.time()
+        run_solver(runtime, task_short_name, config, dependencies,
+                   save_final_state=True, state_dir=outputs_path,
+                   save_screenshots=True, screenshots_dir=screenshots_dir)
+        timings['solve'] = time.time() - start
+
+        start = time.time()
+        run_evaluator(runtime, env_llm_config,
+                      f'/outputs/traj_{task_short_name}.json',
+                      f'/outputs/eval_{task_short_name}.json',
+                      llm_cache_path=f'/outputs/{llm_cache_file}',
+                      collect_metrics=eval_metrics)
+        timings['evaluate'] = time.time() - start
+    finally:
+        runtime.close()
+
+    for prefix in ('traj', 'eval'):
+        filename = f'{prefix}_{task_short_name}.json'
+        shutil.move(os.path.join(temp_dir, filename), os.path.join(outputs_path, filename))
+    if os.path.exists(os.path.join(temp_dir, llm_cache_file)):
+        shutil.move(os.path.join(temp_dir, llm_cache_file), os.path.join(outputs_path, llm_cache_file))
+    return timings
+
+
+def write_timing(timing_log: str, record: dict):
+    with open(timing_log, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+
+def schedule(tasks: List[str], args) -> None:
+    """
+    Greedily start tasks in the given order as long as there is a free worker
+    and none of the task's services is in use by a running task.
+    """
+    outputs_path = os.path.abspath(args.outputs_path)
+    timing_log = os.path.join(outputs_path, 'timing.jsonl')
+    dependencies = {task: read_task_dependencies(task) for task in tasks}
+    mutations = {task: read_task_mutations(task, dependencies[task]) for task in tasks}
+
+    pending = list(tasks)
+    if args.batch_resets:
+        pending = order_for_batching(pending, dependencies, mutations)
+    running = {}
+    busy_services: Set[str] = set()
+    # services known to be in their initial state. The state of a service is
+    # unknown when the scheduler starts, so every service is reset at least once
+    clean_services: Set[str] = set()
+    skipped_resets = 0
+    # one fresh process per task, just like run_eval.sh invoking run_eval.py per task
+    with ProcessPoolExecutor(max_workers=args.num_workers,
+                             mp_context=multiprocessing.get_context('spawn'),
+                             max_tasks_per_child=1) as pool:
+        while pending or running:
+            for task in list(pending):
+                if len(running) >= args.num_workers:
+                    break
+                if dependencies[task] & busy_services:
+                    continue
+                task_image = f"ghcr.io/theagentcompany/{task}-image:{args.version}"
+                skip_reset_services = sorted(dependencies[task] & clean_services) if args.batch_resets else []
+                skipped_resets += len(skip_reset_services)
+                logger.info(f"Starting {task} with services {sorted(dependencies[task])}, "
+                            f"skipping reset of {skip_reset_services}")
+                future = pool.submit(run_task, task, task_image, args.agent_llm_config,
+                                     args.env_llm_config, args.server_hostname, outputs_path,
+                                     skip_reset_services, args.eval_metrics)
+                running[future] = (task, task_image, time.time(), skip_reset_services)
+                busy_services |= dependencies[task]
+                pending.remove(task)
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task, task_image, start, skip_reset_services = running.pop(future)
+                busy_services -= dependencies[task]
+                record = {
+                    'task': task,
+                    'services': sorted(dependencies[task]),
+                    'skipped_resets': skip_reset_services,
+                    'start': start,
+                    'end': time.time(),
+                    'duration': time.time() - start,
+                }
+                try:
+                    record['phases'] = future.result()
+                    record['status'] = 'success'
+                    clean_services |= dependencies[task] - mutations[task]
+                    clean_services -= mutations[task]
+                    logger.info(f"Finished {task} in {record['duration']:.1f}s")
+                except Exception as e:
+                    # same as run_eval.sh, a failed task is skipped and can be resumed later
+                    record['status'] = 'failed'
+                    record['error'] = repr(e)
+                    # we don't know how far the task went, assume all its services are dirty
+                    clean_services -= dependencies[task]
+                    logger.error(f"Task {task} failed: {e}")
+                write_timing(timing_log, record)
+
+                if args.remove_images:
+                    subprocess.run(['docker', 'image', 'rm', task_image], check=False)
+
+    if args.batch_resets:
+        logger.info(f"Skipped {skipped_resets} service resets")
+
+
+if __name__ == '__main__':
+    parser = get_parser()
+    parser.add_argument(
+        '--num-workers',
+        type=int,
+        default=4,
+        help='Maximum number of tasks to run at the same time',
+    )
+    parser.add_argument(
+        '--tasks',
+        type=str,
+        nargs='*',
+        default=None,
+        help='Names of tasks to run, e.g. admin-arrange-meeting-rooms. Defaults to all tasks',
+    )
+    parser.add_argument(
+        '--version',
+        type=str,
+        default='1.0.0',
+        help='Version of the task images to use',
+    )
+    parser.add_argument(
+        '--outputs-path',
+        type=str,
+        default='./outputs',
+        help='Folder path to save trajectories, evaluation results and the timing log'
+    )
+    parser.add_argument(
+        '--server-hostname',
+        type=str,
+        default='localhost',
+        help='Server hostname, e.g. localhost to access the host machine from the container, '
+        'assuming the task docker container is run with `--network host` flag'
+    )
+    parser.add_argument(
+        '--agent-llm-config',
+        type=str,
+        default=None,
+        help='LLM config for agent',
+    )
+    parser.add_argument(
+        '--env-llm-config',
+        type=str,
+        default=None,
+        help='LLM config for evaluation environment (NPC & llm-based evaluator)',
+    )
+    parser.add_argument(
+        '--batch-resets',
+        action='store_true',
+        help='Group tasks by dependencies and skip resets of services that no previous task has mutated',
+    )
+    parser.add_argument(
+        '--eval-metrics',
+        action='store_true',
+        help='Record wall time, HTTP and LLM usage of each grader in the evaluation results',
+    )
+    parser.add_argument(
+        '--remove-images',
+        action='store_true',
+        help='Remove the task image once the task finishes, to save disk space',
+    )
+    args, _ = parser.parse_known_args()
+
+    if args.num_workers < 1:
+        raise ValueError(f'--num-workers must be positive, got {args.num_workers}')
+
+    # fail fast on invalid LLM configs, before any task is launched
+    load_llm_config(args.agent_llm_config, 'agent')
+    load_llm_config(args.env_llm_config, 'evaluation environment')
+
+    os.makedirs(args.outputs_path, exist_ok=True)
+    all_tasks = sorted(os.listdir(TASKS_DIR)) if args.tasks is None else args.tasks
+    tasks = []
+    for task in all_tasks:
+        if os.path.exists(os.path.join(args.outputs_path, f'eval_{task}-image.json')):
+            logger.info(f"Skipping {task} - evaluation file already exists")
+            continue
+        tasks.append(task)
+
+    logger.info(f"Running {len(tasks)} tasks with {args.num_workers} workers")
+    schedule(tasks, args)
+    logger.info("All evaluation completed!")
@@ -1,69 +1,120 @@
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from utils import *
 
 app = Flask(__name__)
 
+def restore_from_snapshot(job, service, mode):
+    """
+    Restore a service from its snapshot if the client asked for it via
+    ?mode=snapshot. Returns False if the caller should fall back to re-creating
+    the container, e.g. when no snapshot has been taken yet.
+    """
+    if mode != 'snapshot':
+        return False
+    if not has_snapshot(service):
+        print(f"No snapshot found for {service}, falling back to re-creating the container")
+        return False
+    with service_locks[service]:
+        if job.run_command(f"make restore-{service}-snapshot"):
+            return True
+    print(f"Failed to restore {service} from snapshot, falling back to re-creating the container")
+    return False
+
+def reset_owncloud_job(job, mode):
+    if restore_from_snapshot(job, 'owncloud', mode):
+        return True
+    # owncloud reset is essentially a restart
+    with service_locks['owncloud']:
+        return job.run_command('make reset-owncloud')
+
+def reset_rocketchat_job(job, mode):
+    return job.run_commands(['make reset-sotopia-redis', 'make reset-rocketchat'])
+
+def reset_plane_job(job, mode):
+    return job.run_command('make reset-plane')
+
+def reset_gitlab_job(job, mode):
+    # devnote: health check + polling on client side is still needed in both
+    # cases because gitlab service takes a while to fully function after it starts
+    if restore_from_snapshot(job, 'gitlab', mode):
+        return True
+    # gitlab reset is essentially a restart
+    with service_locks['gitlab']:
+        return job.run_command('make reset-gitlab')
+
+def submit_reset(service, reset_job, display_name):
+    """
+    Reset a service in the background and return the job id. Pass ?wait=true
+    to block until the reset finishes.
+    """
+    mode = request.args.get('mode')
+    job, created = job_manager.submit(service, lambda job: reset_job(job, mode))
+    if request.args.get('wait', 'false').lower() == 'true':
+        job.done.wait()
+    message = f"Reset {display_name} command initiated" if created else f"Attached to the running reset of {display_name}"
+    return jsonify({"message": message, **job.to_dict()}), 202
+
 @app.route('/api/reset-owncloud', methods=['POST'])
 def reset_owncloud():
-    # owncloud reset is essentially a restart
-    # since it takes a while to stop, we need to make sure this is synchronous
-    execute_command('make reset-owncloud')
-    return jsonify({"message": "Reset ownCloud command initiated"}), 202
+    return submit_reset('owncloud', reset_owncloud_job, 'ownCloud')
 
 @app.route('/api/reset-rocketchat', methods=['POST'])
 def reset_rocketchat():
-    async_execute_command('make reset-sotopia-redis')
-    async_execute_command('make reset-rocketchat')
-    return jsonify({"message": "Reset RocketChat command initiated"}), 202
+    return submit_reset('rocketchat', reset_rocketchat_job, 'RocketChat')
 
 @app.route('/api/reset-plane', methods=['POST'])
 def reset_plane():
-    async_execute_command('make reset-plane')
-    return jsonify({"message": "Reset Plane command initiated"}), 202
+    return submit_reset('plane', reset_plane_job, 'Plane')
 
 @app.route('/api/reset-gitlab', methods=['POST'])
 def reset_gitlab():
-    # gitlab reset is essentially a restart
-    # since it takes a while to stop, we need to make sure this is synchronous
-    # devnote: health check + polling on client side is still needed because
-    # gitlab service takes a while to fully function after the container starts
-    execute_command('make reset-gitlab')
-    return jsonify({"message": "Reset GitLab command initiated"}), 202
+    return submit_reset('gitlab', reset_gitlab_job, 'GitLab')
 
-@app.route('/api/healthcheck/owncloud', methods=['GET'])
-def healthcheck_owncloud():
-    code, msg = check_url("http://localhost:8092")
-    return jsonify({"message":msg}), code
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"message": f"Job {job_id} not found"}), 404
+    return jsonify(job.to_dict()), 200
 
-@app.route('/api/healthcheck/gitlab', methods=['GET'])
-def healthcheck_gitlab():
-    code, msg = check_url("http://localhost:8929")
-    return jsonify({"message":msg}), code
+@app.route('/api/snapshot-<service>', methods=['POST'])
+def snapshot(service):
+    # snapshots must be taken when the service is in its initial state
+    if service not in SNAPSHOT_SERVICE_URLS:
+        return jsonify({"message": f"Snapshot is not supported for {service}"}), 400
+    if take_snapshot(service):
+        return jsonify({"message": f"Snapshot of {service} taken"}), 200
+    return jsonify({"message": f"Failed to take snapshot of {service}"}), 500
 
-@app.route('/api/healthcheck/rocketchat', methods=['GET'])
-def healthcheck_rocketchat():
-    rocketchat_cli = create_rocketchat_client()
+def check_owncloud():
+    code, msg = check_url(SNAPSHOT_SERVICE_URLS['owncloud'])
+    return code, {"message": msg}
+
+def check_gitlab():
+    code, msg = check_url(SNAPSHOT_SERVICE_URLS['gitlab'])
+    return code, {"message": msg}
+
+def check_rocketchat():
+    rocketchat_cli = get_rocketchat_client()
     rocketchat_code = 400 if rocketchat_cli is None else 200
-    _, redis_code = healthcheck_redis()
+    redis_code, _ = cached_checks['redis']()
     # Sotopia is optional if no NPC is needed for the task,
     # but for simplicity, we always check Sotopia NPC profiles are correctly
     # loaded whenever RocketChat service is needed
-    _, sotopia_code = healthcheck_sotopia()
+    sotopia_code, _ = cached_checks['sotopia']()
     code = 200 if redis_code == 200 and rocketchat_code == 200 and sotopia_code == 200 else 400
-    return jsonify({"redis": redis_code, "rocketchat": rocketchat_code, "sotopia": sotopia_code}), code
+    return code, {"redis": redis_code, "rocketchat": rocketchat_code, "sotopia": sotopia_code}
 
-@app.route('/api/healthcheck/plane', methods=['GET'])
-def healthcheck_plane():
+def check_plane():
     code, msg = login_to_plane()
-    return jsonify({"message":msg}), code
-    
-@app.route('/api/healthcheck/redis', methods=['GET'])
-def healthcheck_redis():
+    return code, {"message": msg}
+
+def check_redis():
     success = wait_for_redis()
     if success:
-        return jsonify({"message":"success connect to redis"}), 200
+        return 200, {"message": "success connect to redis"}
     else:
-        return jsonify({"message":"failed connect to redis"}), 400
+        return 400, {"message": "failed connect to redis"}
 
 def get_by_name(first_name, last_name):
     return AgentProfile.find(
@@ -71,25 +122,118 @@ def get_by_name(first_name, last_name):
         (AgentProfile.last_name == last_name)
     ).all()
 
-@app.route('/api/healthcheck/sotopia', methods=['GET'])
-def healthcheck_sotopia():
+def check_sotopia():
     success = wait_for_redis()
     assert len(agent_definitions) > 0
     if success:
+        # look up all NPC profiles in one query rather than one query per NPC
+        first_names = list({definition["first_name"] for definition in agent_definitions})
+        loaded = {
+            (profile.first_name, profile.last_name)
+            for profile in AgentProfile.find(AgentProfile.first_name << first_names).all()
+        }
         for definition in agent_definitions:
-            if not AgentProfile.find((AgentProfile.first_name == definition["first_name"]) & (AgentProfile.last_name == definition["last_name"])).all():
+            if (definition["first_name"], definition["last_name"]) not in loaded:
                 success = False
                 print(f"NPC ({definition['first_name']} {definition['last_name']}) not found")
                 break
         
     if success:
-        return jsonify({"message":"sotopia npc profiles loaded successfully"}), 200
+        return 200, {"message": "sotopia npc profiles loaded successfully"}
     else:
-        return jsonify({"message":"sotopia npc profiles not loaded"}), 400
+        return 400, {"message": "sotopia npc profiles not loaded"}
+
+SERVICE_CHECKS = {
+    'owncloud': check_owncloud,
+    'gitlab': check_gitlab,
+    'rocketchat': check_rocketchat,
+    'plane': check_plane,
+}
+
+# every task container polls health checks, so results are cached for a short
+# while and shared by concurrent callers
+cached_checks = {
+    name: CachedCheck(check, HEALTHCHECK_CACHE_TTL)
+    for name, check in {**SERVICE_CHECKS, 'redis': check_redis, 'sotopia': check_sotopia}.items()
+}
+
+def invalidate_health(service):
+    cached_checks[service].invalidate()
+    if service == 'rocketchat':
+        # rocketchat reset also resets sotopia redis
+        cached_checks['redis'].invalidate()
+        cached_checks['sotopia'].invalidate()
+
+def is_healthy(service):
+    def healthy():
+        code, _ = cached_checks[service]()
+        return code == 200
+    return healthy
+
+readiness_monitor = ReadinessMonitor({service: is_healthy(service) for service in SERVICE_CHECKS},
+                                     on_reset=invalidate_health)
+job_manager = JobManager(readiness_monitor)
+
+def check_service(service):
+    # a service that is being reset is not healthy, even if it still responds
+    if readiness_monitor.is_resetting(service):
+        return 503, {"message": f"{service} is being reset"}
+    return cached_checks[service]()
+
+@app.route('/api/healthcheck/owncloud', methods=['GET'])
+def healthcheck_owncloud():
+    code, payload = check_service('owncloud')
+    return jsonify(payload), code
+
+@app.route('/api/healthcheck/gitlab', methods=['GET'])
+def healthcheck_gitlab():
+    code, payload = check_service('gitlab')
+    return jsonify(payload), code
+
+@app.route('/api/healthcheck/rocketchat', methods=['GET'])
+def healthcheck_rocketchat():
+    code, payload = check_service('rocketchat')
+    return jsonify(payload), code
+
+@app.route('/api/healthcheck/plane', methods=['GET'])
+def healthcheck_plane():
+    code, payload = check_service('plane')
+    return jsonify(payload), code
+    
+@app.route('/api/healthcheck/redis', methods=['GET'])
+def healthcheck_redis():
+    code, payload = cached_checks['redis']()
+    return jsonify(payload), code
+
+@app.route('/api/healthcheck/sotopia', methods=['GET'])
+def healthcheck_sotopia():
+    code, payload = cached_checks['sotopia']()
+    return jsonify(payload), code
+
+@app.route('/api/wait-ready', methods=['GET'])
+def wait_ready():
+    """
+    Long-poll until all given services are healthy, e.g.
+    /api/wait-ready?services=gitlab,plane&timeout=900
+    Returns 200 as soon as all services are ready, or 503 on timeout.
+    """
+    services = [service for service in request.args.get('services', '').split(',') if service]
+    unknown_services = [service for service in services if service not in SERVICE_CHECKS]
+    if unknown_services:
+        return jsonify({"message": f"Unknown services: {unknown_services}"}), 400
+    try:
+        timeout = float(request.args.get('timeout', 900))
+    except ValueError:
+        return jsonify({"message": "timeout must be a number"}), 400
+
+    ready = readiness_monitor.wait(services, timeout)
+    return jsonify({"ready": ready, "services": readiness_monitor.status(services)}), 200 if ready else 503
 
 if __name__ == '__main__':
     if SKIP_SETUP:
         print(f"Skip the setup")
     else:
         execute_command("make start-all")
+        # services are in their initial state right after start-all
+        async_take_snapshots_when_healthy()
     app.run(host='0.0.0.0', port=2999)
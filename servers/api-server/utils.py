@@ -9,6 +9,7 @@ import requests
 import time
 import json
 import logging
+import uuid
 
 
 SERVER_HOSTNAME = os.getenv('SERVER_HOSTNAME') or 'localhost'
@@ -28,6 +29,17 @@ with open('/rocketchat/npc_definition.json', 'r') as file:
 HOSTNAME = os.getenv('HOSTNAME', "localhost")
 EXECUTION_DIR = os.getenv('EXECUTION_DIR', "/workspace")
 SKIP_SETUP = os.getenv('SKIP_SETUP', 'False').lower() == 'true'
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', "/snapshots")
+# health check results are shared by all callers within this many seconds
+HEALTHCHECK_CACHE_TTL = float(os.getenv('HEALTHCHECK_CACHE_TTL', 3))
+# services whose data lives in their containers, and can thus be restored from
+# a snapshot of the data directories rather than by re-creating the containers
+SNAPSHOT_SERVICE_URLS = {
+    'gitlab': "http://localhost:8929",
+    'owncloud': "http://localhost:8092",
+}
+# prevents snapshot and reset of the same service from running at the same time
+service_locks = {service: threading.Lock() for service in SNAPSHOT_SERVICE_URLS}
 
 def login_to_plane():
     res = []
@@ -52,7 +64,7 @@ def get_all_plane_projects():
         print(f"Get all projects failed: {e}")
         return []
 
-def create_rocketchat_client(username='theagentcompany', password='theagentcompany'):
+def create_rocketchat_client(username='theagentcompany', password='theagentcompany', session=None):
     SERVER_HOSTNAME = os.getenv('SERVER_HOSTNAME') or 'localhost'
     ROCKETCHAT_PORT = os.getenv('ROCKETCHAT_PORT') or '3000'
     
@@ -60,13 +72,43 @@ def create_rocketchat_client(username='theagentcompany', password='theagentcompa
     ROCKETCHAT_URL = f"http://{SERVER_HOSTNAME}:{ROCKETCHAT_PORT}"
     
     try:
-        return RocketChat(username, password, server_url=ROCKETCHAT_URL)
+        return RocketChat(username, password, server_url=ROCKETCHAT_URL, session=session)
     except:
         logging.warning("Fail to connect to rocketchat")
     return None
 
+# cached RocketChat client, reused across health checks to avoid a login per check
+_rocketchat_client = None
+_rocketchat_session = requests.Session()
+_rocketchat_client_lock = threading.Lock()
+
+def get_rocketchat_client():
+    """
+    Return a logged-in RocketChat client, reusing the previous session as long as
+    it is still valid (e.g. it becomes invalid after RocketChat is reset).
+    """
+    global _rocketchat_client
+    with _rocketchat_client_lock:
+        if _rocketchat_client is not None:
+            try:
+                if _rocketchat_client.me().json().get('success'):
+                    return _rocketchat_client
+            except Exception as e:
+                logging.warning(f"Cached rocketchat session is no longer valid: {e}")
+        _rocketchat_client = create_rocketchat_client(session=_rocketchat_session)
+        return _rocketchat_client
+
+# connection pools keyed by (host, port, password), shared by all redis clients
+_redis_pools = {}
+
+def get_redis_client(host='localhost', port=6379, password='theagentcompany'):
+    key = (host, port, password)
+    if key not in _redis_pools:
+        _redis_pools[key] = redis.ConnectionPool(host=host, port=port, password=password)
+    return redis.StrictRedis(connection_pool=_redis_pools[key])
+
 def wait_for_redis(host='localhost', port=6379, password='theagentcompany', retries=3, delay=1):
-    client = redis.StrictRedis(host=host, port=port, password=password)
+    client = get_redis_client(host=host, port=port, password=password)
     
     for attempt in range(retries):
         try:
@@ -130,3 +172,277 @@ def execute_command(command):
 
 def async_execute_command(command):
     threading.Thread(target=execute_command, args=(command,)).start()
+
+class CachedCheck:
+    """
+    Caches the result of a health check for ttl seconds. Concurrent callers
+    share one in-flight check instead of each running their own.
+    """
+    def __init__(self, check, ttl):
+        self.check = check
+        self.ttl = ttl
+        self.result = None
+        self.checked_at = 0
+        self.inflight = None
+        # bumped on invalidation, so that a check started before is not cached
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def invalidate(self):
+        with self.lock:
+            self.result = None
+            self.generation += 1
+
+    def __call__(self):
+        with self.lock:
+            if self.result is not None and time.time() - self.checked_at < self.ttl:
+                return self.result
+            inflight = self.inflight
+            if inflight is None:
+                self.inflight = threading.Event()
+                generation = self.generation
+
+        if inflight is not None:
+            # another caller is running the check, wait for its result
+            inflight.wait()
+            with self.lock:
+                if self.result is not None:
+                    return self.result
+            return self()
+
+        try:
+            result = self.check()
+        except Exception as e:
+            print(f"Health check failed: {e}")
+            result = (500, {"message": f"health check failed: {e}"})
+        with self.lock:
+            if generation == self.generation:
+                self.result = result
+                self.checked_at = time.time()
+            self.inflight.set()
+            self.inflight = None
+        return result
+
+class ReadinessMonitor:
+    """
+    Tracks whether services are ready. While there is at least one waiter for a
+    service, a dedicated thread keeps checking its health, so that all services
+    are checked concurrently and waiters are woken up as soon as the state changes.
+    A service that is being reset is never reported as ready.
+    """
+    def __init__(self, checks, interval=1, on_reset=None):
+        self.checks = checks
+        self.interval = interval
+        # called with the service name when a reset begins or ends
+        self.on_reset = on_reset
+        self.ready = {service: False for service in checks}
+        self.waiters = {service: 0 for service in checks}
+        self.resets = {service: 0 for service in checks}
+        self.checkers = set()
+        self.condition = threading.Condition()
+
+    def begin_reset(self, service):
+        with self.condition:
+            self.resets[service] += 1
+            self.ready[service] = False
+            self.condition.notify_all()
+        if self.on_reset is not None:
+            self.on_reset(service)
+
+    def end_reset(self, service):
+        if self.on_reset is not None:
+            self.on_reset(service)
+        with self.condition:
+            self.resets[service] -= 1
+            self.condition.notify_all()
+
+    def is_resetting(self, service):
+        with self.condition:
+            return self.resets[service] > 0
+
+    def status(self, services):
+        with self.condition:
+            return {service: self.ready[service] for service in services}
+
+    def _check_loop(self, service):
+        while True:
+            with self.condition:
+                if self.waiters[service] == 0:
+                    self.checkers.discard(service)
+                    return
+                resetting = self.resets[service] > 0
+            # run the (slow) health check without holding the lock
+            healthy = not resetting and self.checks[service]()
+            with self.condition:
+                # the service might have been reset during the health check
+                healthy = healthy and self.resets[service] == 0
+                if healthy != self.ready[service]:
+                    self.ready[service] = healthy
+                    self.condition.notify_all()
+            time.sleep(self.interval)
+
+    def wait(self, services, timeout):
+        """Block until all services are ready, returns False on timeout"""
+        with self.condition:
+            for service in services:
+                self.waiters[service] += 1
+                if service not in self.checkers:
+                    # the last known state might be stale, since nobody checked it since
+                    self.ready[service] = False
+                    self.checkers.add(service)
+                    threading.Thread(target=self._check_loop, args=(service,), daemon=True).start()
+            try:
+                return self.condition.wait_for(lambda: all(self.ready[service] for service in services), timeout)
+            finally:
+                for service in services:
+                    self.waiters[service] -= 1
+
+def try_execute_command(command):
+    """Execute a command, and return whether it succeeded"""
+    try:
+        print(EXECUTION_DIR, command)
+        os.chdir(EXECUTION_DIR)
+        subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"Command execute failed: {e}, stderr: {e.stderr}")
+        return False
+
+def has_snapshot(service):
+    return os.path.exists(os.path.join(SNAPSHOT_DIR, f"{service}.tar"))
+
+def take_snapshot(service):
+    with service_locks[service]:
+        return try_execute_command(f"make snapshot-{service}")
+
+def take_snapshots_when_healthy(timeout=1800, interval=10):
+    """
+    Snapshot services once they become healthy after their first boot, so that
+    later resets can restore the snapshot instead of re-creating containers.
+    """
+    for service, url in SNAPSHOT_SERVICE_URLS.items():
+        deadline = time.time() + timeout
+        healthy = check_url(url)[0] == 200
+        while not healthy and time.time() < deadline:
+            time.sleep(interval)
+            healthy = check_url(url)[0] == 200
+        if not healthy:
+            # a half-booted service must not become the state that resets restore,
+            # so resets keep re-creating its container instead
+            print(f"{service} is not healthy after {timeout}s, not taking a snapshot")
+        elif take_snapshot(service):
+            print(f"Snapshot of {service} taken")
+        else:
+            print(f"Failed to take snapshot of {service}")
+
+def async_take_snapshots_when_healthy():
+    threading.Thread(target=take_snapshots_when_healthy, daemon=True).start()
+
+class Job:
+    """A background reset of a service, made of one or more command steps"""
+    def __init__(self, service):
+        self.id = uuid.uuid4().hex
+        self.service = service
+        self.status = 'running'
+        self.steps = []
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+
+    def run_command(self, command):
+        """Run a command as a step of this job, and return whether it succeeded"""
+        step = {"command": command, "status": "running", "returncode": None, "output": ""}
+        with self.lock:
+            self.steps.append(step)
+        print(EXECUTION_DIR, command)
+        result = subprocess.run(command, shell=True, cwd=EXECUTION_DIR, capture_output=True, text=True)
+        with self.lock:
+            step["returncode"] = result.returncode
+            step["status"] = "succeeded" if result.returncode == 0 else "failed"
+            # only keep the tail of the output, which is where errors show up
+            step["output"] = (result.stdout + result.stderr)[-2000:]
+        return result.returncode == 0
+
+    def run_commands(self, commands):
+        """Run commands as concurrent steps of this job, and return whether all of them succeeded"""
+        results = [False] * len(commands)
+        def run(index, command):
+            results[index] = self.run_command(command)
+        threads = [threading.Thread(target=run, args=(index, command)) for index, command in enumerate(commands)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return all(results)
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                "job_id": self.id,
+                "service": self.service,
+                "status": self.status,
+                "steps": [dict(step) for step in self.steps],
+                "error": self.error,
+                "created_at": self.created_at,
+                "finished_at": self.finished_at,
+            }
+
+class JobManager:
+    """
+    Runs service resets as background jobs. Resets of the same service are
+    coalesced: a request for a service that is already being reset attaches
+    to the running job instead of starting another one.
+    """
+    def __init__(self, readiness_monitor, max_finished_jobs=1000):
+        self.readiness_monitor = readiness_monitor
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs = {}
+        self.active = {}
+        self.lock = threading.Lock()
+
+    def submit(self, service, run):
+        """
+        Start run(job) in the background unless the service is already being
+        reset. Returns the job and whether it was newly created.
+        """
+        with self.lock:
+            if service in self.active:
+                return self.active[service], False
+            job = Job(service)
+            self.jobs[job.id] = job
+            self.active[service] = job
+            self._prune()
+        # the service must not be reported as ready until the reset completes
+        self.readiness_monitor.begin_reset(service)
+        threading.Thread(target=self._run, args=(job, run), daemon=True).start()
+        return job, True
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _run(self, job, run):
+        try:
+            success = run(job)
+            status = 'succeeded' if success else 'failed'
+            error = None
+        except Exception as e:
+            print(f"Job {job.id} to reset {job.service} failed: {e}")
+            status = 'failed'
+            error = str(e)
+        with self.lock:
+            self.active.pop(job.service, None)
+        self.readiness_monitor.end_reset(job.service)
+        with job.lock:
+            job.status = status
+            job.error = error
+            job.finished_at = time.time()
+        job.done.set()
+
+    def _prune(self):
+        finished = [job for job in self.jobs.values() if job.done.is_set()]
+        excess = len(finished) - self.max_finished_jobs
+        for job in sorted(finished, key=lambda job: job.created_at)[:max(excess, 0)]:
+            del self.jobs[job.id]
@@ -1,16 +1,36 @@
+import asyncio
 import base64
+import contextlib
+import contextvars
+import copy
+import hashlib
+import json
 import os
 import logging
 import urllib
 import subprocess
+import zlib
 import functools
 import re
+import sqlite3
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 import requests
 
 import litellm
 from rocketchat_API.rocketchat import RocketChat
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 import xml.etree.ElementTree as ET
+from io import BytesIO
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
 
 from config import *
 
@@ -20,6 +40,197 @@ IMAGE_JPEG = 'image/jpeg'
 IMAGE_PNG = 'image/png'
 
 
+# metrics being collected in the current context, innermost last
+_active_metrics = contextvars.ContextVar('active_metrics', default=())
+_metrics_lock = threading.Lock()
+_metrics_enabled = METRICS_ENABLED
+# metrics of every grader call, in the order they finish
+grader_metrics = []
+
+
+def enable_metrics(enabled: bool = True):
+    """Turn collection of per-grader metrics on or off"""
+    global _metrics_enabled
+    _metrics_enabled = enabled
+
+
+def metrics_enabled() -> bool:
+    return _metrics_enabled
+
+
+@contextlib.contextmanager
+def collect_metrics():
+    """
+    Collect wall time, HTTP calls per service, bytes downloaded, and LLM calls and
+    tokens within the block, including threads and tasks started with a copy of the
+    current context. Yields the metrics dict, which is complete once the block exits.
+    """
+    metrics = {'wall_time': 0.0, 'http_calls': {}, 'bytes_downloaded': 0,
+               'llm_calls': 0, 'llm_cache_hits': 0, 'llm_tokens': 0}
+    token = _active_metrics.set(_active_metrics.get() + (metrics,))
+    start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics['wall_time'] = round(time.perf_counter() - start, 3)
+        _active_metrics.reset(token)
+
+
+def record_metric(name: str, amount: int = 1, service: str = None):
+    """Add amount to a metric of all collections active in this context, per service if given"""
+    active = _active_metrics.get()
+    if not active:
+        return
+    with _metrics_lock:
+        for metrics in active:
+            if service is None:
+                metrics[name] += amount
+            else:
+                metrics[name][service] = metrics[name].get(service, 0) + amount
+
+
+class TimeoutSession(requests.Session):
+    """A requests session that applies a default timeout to every request, and records metrics"""
+
+    def __init__(self, timeout: float, service: str = 'default'):
+        super().__init__()
+        self.timeout = timeout
+        self.service = service
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        response = super().request(method, url, **kwargs)
+        record_metric('http_calls', service=self.service)
+        if kwargs.get('stream'):
+            # don't consume streamed content, rely on the announced size instead
+            record_metric('bytes_downloaded', int(response.headers.get('Content-Length') or 0))
+        else:
+            record_metric('bytes_downloaded', len(response.content))
+        return response
+
+
+def create_http_session(headers: dict = None, auth=None, service: str = 'default') -> requests.Session:
+    """
+    Create a session with connection pooling, keep-alive, a default timeout, and
+    retries with exponential backoff on connection errors and 502/503/504 responses.
+    Requests are counted towards metrics of the given service.
+    """
+    session = TimeoutSession(HTTP_TIMEOUT, service)
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=[502, 503, 504],
+        # only retry idempotent requests, including WebDAV PROPFIND
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {'PROPFIND'},
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    if auth:
+        session.auth = auth
+    return session
+
+
+# one session per service, so that connections are reused across helper calls
+gitlab_session = create_http_session(headers=GITLAB_HEADERS, service='gitlab')
+plane_session = create_http_session(headers=PLANE_HEADERS, service='plane')
+owncloud_session = create_http_session(auth=HTTPBasicAuth(OWNCLOUD_USERNAME, OWNCLOUD_PASSWORD), service='owncloud')
+rocketchat_session = create_http_session(service='rocketchat')
+# for arbitrary URLs, e.g. images
+default_session = create_http_session()
+
+
+_read_cache = {}
+_read_cache_lock = threading.Lock()
+_read_cache_enabled = READ_CACHE_ENABLED
+read_cache_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def enable_read_cache(enabled: bool = True):
+    """Turn the read cache of service lookups on or off for the current process"""
+    global _read_cache_enabled
+    _read_cache_enabled = enabled
+    if not enabled:
+        clear_read_cache()
+
+
+def clear_read_cache():
+    """
+    Drop all cached lookups. Called by the write helpers in this module; evaluators
+    that change service state through other means should call it too.
+    """
+    with _read_cache_lock:
+        if _read_cache:
+            read_cache_stats['invalidations'] += 1
+        _read_cache.clear()
+
+
+def log_read_cache_stats():
+    if _read_cache_enabled:
+        logging.info(f"Read cache stats: {read_cache_stats['hits']} hits, {read_cache_stats['misses']} misses, "
+                     f"{read_cache_stats['invalidations']} invalidations")
+
+
+def _freeze(value):
+    """Turn dicts, lists and sets into hashable equivalents, so that they can be part of a cache key"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+def read_cached(func=None, *, cache_if=lambda result: result is not None):
+    """
+    Memoize a read-only lookup for READ_CACHE_TTL seconds, keyed by its arguments.
+    Does nothing unless the read cache is enabled. Results for which cache_if
+    returns False (e.g. failed lookups) are not cached. Callers get a copy of
+    the cached value, so they can't modify the cache by mutating it.
+    """
+    if func is None:
+        return functools.partial(read_cached, cache_if=cache_if)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _read_cache_enabled:
+            return func(*args, **kwargs)
+        try:
+            key = (func.__qualname__, _freeze(args), _freeze(kwargs))
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        with _read_cache_lock:
+            entry = _read_cache.get(key)
+            if entry is not None and time.monotonic() - entry[0] < READ_CACHE_TTL:
+                read_cache_stats['hits'] += 1
+                return copy.deepcopy(entry[1])
+            read_cache_stats['misses'] += 1
+
+        result = func(*args, **kwargs)
+        if cache_if(result):
+            with _read_cache_lock:
+                _read_cache[key] = (time.monotonic(), copy.deepcopy(result))
+        return result
+    return wrapper
+
+
+def invalidates_read_cache(func):
+    """Mark a helper that changes service state, so that cached lookups are dropped"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            clear_read_cache()
+    return wrapper
+
+
 class MockRocketChatClient:
 
     class JsonResponse:
@@ -35,31 +246,283 @@ class MockRocketChatClient:
 def grader(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        try:
-            result = func(*args, **kwargs)
-            if result is None:
-                logging.warning(f"Grader returns None, using False instead")
-                return False
-            return result
-        except Exception as e:
-            logging.error(f"Error in {func.__name__}: {str(e)}")
-            return False
+        if not _metrics_enabled:
+            return _run_grader(func, *args, **kwargs)
+        with collect_metrics() as metrics:
+            result = _run_grader(func, *args, **kwargs)
+        with _metrics_lock:
+            grader_metrics.append({'grader': func.__name__, **metrics})
+        return result
     return wrapper
+
+
+def _run_grader(func, *args, **kwargs):
+    try:
+        result = func(*args, **kwargs)
+        if result is None:
+            logging.warning(f"Grader returns None, using False instead")
+            return False
+        return result
+    except Exception as e:
+        logging.error(f"Error in {func.__name__}: {str(e)}")
+        return False
     
 
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+_llm_cache_enabled = bool(LLM_CACHE_PATH)
+llm_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def enable_llm_cache(enabled: bool = True):
+    """Turn the on-disk LLM response cache on or off. It is only used if LLM_CACHE_PATH is set"""
+    global _llm_cache_enabled
+    _llm_cache_enabled = enabled and bool(LLM_CACHE_PATH)
+
+
+def _get_llm_cache():
+    """Open the LLM cache database on first use. Returns None if the cache is disabled"""
+    global _llm_cache, _llm_cache_enabled
+    if not _llm_cache_enabled:
+        return None
+    if _llm_cache is None:
+        try:
+            cache_dir = os.path.dirname(LLM_CACHE_PATH)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            _llm_cache = sqlite3.connect(LLM_CACHE_PATH, timeout=30, check_same_thread=False)
+            _llm_cache.execute(
+                'CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)'
+            )
+            _llm_cache.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Failed to open LLM cache at {LLM_CACHE_PATH}, not caching LLM responses: {e}")
+            _llm_cache_enabled = False
+            return None
+    return _llm_cache
+
+
+def llm_cache_key(messages) -> str:
+    """
+    Hash of the model, the server and messages, including any base64 encoded images.
+    The server is part of the key, so that e.g. answers of the local LLM server are
+    never returned for the real model.
+    """
+    payload = json.dumps({'model': LITELLM_MODEL, 'base_url': LITELLM_BASE_URL, 'messages': messages}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def log_llm_cache_stats():
+    if _llm_cache_enabled:
+        total = llm_cache_stats['hits'] + llm_cache_stats['misses']
+        hit_rate = llm_cache_stats['hits'] / total if total else 0
+        logging.info(f"LLM cache stats: {llm_cache_stats['hits']} hits, {llm_cache_stats['misses']} misses, "
+                     f"hit rate {hit_rate:.0%}")
+
+
+def _llm_cache_lookup(messages):
+    """Returns the cache key and the cached response if any, or (None, None) if the cache is disabled"""
+    with _llm_cache_lock:
+        cache = _get_llm_cache()
+        if cache is None:
+            return None, None
+        key = llm_cache_key(messages)
+        row = cache.execute('SELECT response FROM completions WHERE key = ?', (key,)).fetchone()
+        if row is not None:
+            llm_cache_stats['hits'] += 1
+            return key, json.loads(row[0])
+        llm_cache_stats['misses'] += 1
+        return key, None
+
+
+def _llm_cache_store(key, response):
+    if key is None:
+        return
+    with _llm_cache_lock:
+        cache = _get_llm_cache()
+        cache.execute('INSERT OR REPLACE INTO completions VALUES (?, ?, ?)', (key, json.dumps(response), time.time()))
+        cache.commit()
+
+
+def _record_llm_metrics(response):
+    record_metric('llm_calls')
+    record_metric('llm_tokens', (response.get('usage') or {}).get('total_tokens') or 0)
+
+
 # messages: a list of message.
 # example [{ "content": "Hello, how are you?","role": "user"}]
 def llm_complete(messages):
-    if TEST_MODE:
+    if TEST_MODE and not LOCAL_LLM:
         return {'choices': [{'message': {"content": "Hello, how are you?","role": "user"}}]}
 
-    return litellm.completion(
+    key, response = _llm_cache_lookup(messages)
+    if response is not None:
+        record_metric('llm_cache_hits')
+        return response
+
+    response = litellm.completion(
         api_key=LITELLM_API_KEY,
         base_url=LITELLM_BASE_URL,
         model=LITELLM_MODEL,
         messages=messages
     ).json()
 
+    _record_llm_metrics(response)
+    _llm_cache_store(key, response)
+    return response
+
+
+async def llm_acomplete(messages):
+    """Async version of llm_complete, which retries with exponential backoff when rate limited"""
+    if TEST_MODE and not LOCAL_LLM:
+        return {'choices': [{'message': {"content": "Hello, how are you?","role": "user"}}]}
+
+    key, response = _llm_cache_lookup(messages)
+    if response is not None:
+        record_metric('llm_cache_hits')
+        return response
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            response = await litellm.acompletion(
+                api_key=LITELLM_API_KEY,
+                base_url=LITELLM_BASE_URL,
+                model=LITELLM_MODEL,
+                messages=messages
+            )
+            break
+        except litellm.RateLimitError as e:
+            if attempt == LLM_MAX_RETRIES:
+                raise
+            delay = LLM_BACKOFF_FACTOR * 2 ** attempt
+            logging.warning(f"Rate limited by LLM, retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+
+    response = response.json()
+    _record_llm_metrics(response)
+    _llm_cache_store(key, response)
+    return response
+
+
+# weak references to all proxies, so that they can be reset after the services are reset.
+# Not a WeakSet, since hashing a proxy creates its object
+_lazy_proxies = []
+
+
+class LazyProxy:
+    """
+    Stand-in for an object that is only created on first use, e.g. a service client or
+    an id looked up at evaluator module scope. Attribute access, calls, formatting,
+    comparisons and hashing are forwarded to the object, which is created once. If
+    creating it fails, the error is raised on use, and creation is retried next time.
+    """
+
+    _UNSET = object()
+
+    def __init__(self, factory):
+        self._lazy_factory = factory
+        self._lazy_value = LazyProxy._UNSET
+        self._lazy_lock = threading.Lock()
+        _lazy_proxies.append(weakref.ref(self))
+
+    def _lazy_resolve(self):
+        if self._lazy_value is LazyProxy._UNSET:
+            with self._lazy_lock:
+                if self._lazy_value is LazyProxy._UNSET:
+                    self._lazy_value = self._lazy_factory()
+        return self._lazy_value
+
+    def _lazy_reset(self):
+        """Forget the object, so that it is created again on next use"""
+        with self._lazy_lock:
+            self._lazy_value = LazyProxy._UNSET
+
+    def __getattr__(self, name):
+        # only called for attributes not found on the proxy itself
+        if name.startswith('_lazy_'):
+            raise AttributeError(name)
+        return getattr(self._lazy_resolve(), name)
+
+    def __repr__(self):
+        if self._lazy_value is LazyProxy._UNSET:
+            return f"<LazyProxy of {self._lazy_factory!r}, not created yet>"
+        return repr(self._lazy_value)
+
+    def __str__(self):
+        return str(self._lazy_resolve())
+
+    def __format__(self, format_spec):
+        return format(self._lazy_resolve(), format_spec)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyProxy):
+            other = other._lazy_resolve()
+        return self._lazy_resolve() == other
+
+    def __hash__(self):
+        return hash(self._lazy_resolve())
+
+    def __bool__(self):
+        return bool(self._lazy_resolve())
+
+    def __len__(self):
+        return len(self._lazy_resolve())
+
+    def __iter__(self):
+        return iter(self._lazy_resolve())
+
+    def __contains__(self, item):
+        return item in self._lazy_resolve()
+
+    def __getitem__(self, key):
+        return self._lazy_resolve()[key]
+
+    def __call__(self, *args, **kwargs):
+        return self._lazy_resolve()(*args, **kwargs)
+
+
+def lazy(func, *args, **kwargs):
+    """
+    Defer func(*args, **kwargs) until the result is first used, e.g.
+    PROJECT_ID = lazy(get_plane_project_id, PROJECT_NAME)
+    """
+    return LazyProxy(functools.partial(func, *args, **kwargs))
+
+
+_rocketchat_clients = {}
+_rocketchat_clients_lock = threading.Lock()
+
+
+def get_shared_rocketchat_client(username='theagentcompany', password='theagentcompany'):
+    """Get a RocketChat client logged in as the given user, shared by all callers in this process"""
+    with _rocketchat_clients_lock:
+        if username not in _rocketchat_clients:
+            _rocketchat_clients[username] = create_rocketchat_client(username, password)
+        return _rocketchat_clients[username]
+
+
+def reset_shared_clients():
+    """
+    Log in again on next use of the shared RocketChat clients, and re-create all lazily
+    created objects, e.g. after the services have been reset and old sessions and ids
+    are no longer valid.
+    """
+    with _rocketchat_clients_lock:
+        _rocketchat_clients.clear()
+    _lazy_proxies[:] = [ref for ref in _lazy_proxies if ref() is not None]
+    for ref in list(_lazy_proxies):
+        proxy = ref()
+        if proxy is not None:
+            proxy._lazy_reset()
+
+
+def lazy_rocketchat_client(username='theagentcompany', password='theagentcompany'):
+    """
+    Drop-in replacement for create_rocketchat_client at module scope, which only logs
+    in when the client is first used, and shares one client per user in this process.
+    """
+    return lazy(get_shared_rocketchat_client, username, password)
+
 
 def create_rocketchat_client(username='theagentcompany', password='theagentcompany'):
     SERVER_HOSTNAME = os.getenv('SERVER_HOSTNAME') or 'the-agent-company.com'
@@ -69,7 +532,7 @@ def create_rocketchat_client(username='theagentcompany', password='theagentcompa
     ROCKETCHAT_URL = f"http://{SERVER_HOSTNAME}:{ROCKETCHAT_PORT}"
     
     try:
-        return RocketChat(username, password, server_url=ROCKETCHAT_URL)
+        return RocketChat(username, password, server_url=ROCKETCHAT_URL, session=rocketchat_session)
     except:
         logging.warning("Fail to connect to rocketchat")
         if TEST_MODE:
@@ -79,6 +542,268 @@ def create_rocketchat_client(username='theagentcompany', password='theagentcompa
             raise
 
 
+@read_cached
+def get_rocketchat_users(rocket_client):
+    """Get all users on the RocketChat server, as returned by the users.list API"""
+    return rocket_client.users_list().json()['users']
+
+
+@read_cached
+def get_rocketchat_user(rocket_client, username: str):
+    """
+    Get a RocketChat user, given either the username or the display name, or None if
+    there is no such user. Looks up the username on the server first, and only lists
+    all users if that fails, e.g. because a display name is given.
+    """
+    response = rocket_client.users_info(username=username).json()
+    if response.get('success'):
+        return response['user']
+
+    for item in get_rocketchat_users(rocket_client):
+        if item.get('nameInsensitive', '').lower() == username.lower() or item.get('username', '').lower() == username.lower():
+            return item
+    return None
+
+
+def get_rocketchat_user_id(rocket_client, username: str):
+    """Get the id of a RocketChat user, given either the username or the display name"""
+    user = get_rocketchat_user(rocket_client, username)
+    return None if user is None else user['_id']
+
+
+# room type -> (list method, key of the rooms in its response, history method)
+ROCKETCHAT_ROOM_TYPES = {
+    'd': ('im_list', 'ims', 'im_history'),
+    'c': ('channels_list', 'channels', 'channels_history'),
+    'p': ('groups_list', 'groups', 'groups_history'),
+}
+
+
+def iter_rocketchat_room_history(rocket_client, room_id, room_type: str = 'c', oldest: str = None, page_size: int = None):
+    """
+    Iterate over the messages of a RocketChat room, newest first, going back in time with
+    count/offset paging. Only as many pages as the caller consumes are fetched, so e.g.
+    looking for a message stops at the first page containing it.
+
+    room_type is 'c' for channels, 'p' for private groups and 'd' for direct messages.
+    If oldest (a message timestamp) is given, only messages posted after it are returned.
+
+    Raises RuntimeError if a page cannot be fetched.
+    """
+    history = getattr(rocket_client, ROCKETCHAT_ROOM_TYPES[room_type][2])
+    page_size = page_size or ROCKETCHAT_HISTORY_PAGE_SIZE
+    seen = set()
+
+    def fetch_page(offset):
+        params = {'count': page_size, 'offset': offset}
+        if oldest:
+            params['oldest'] = oldest
+        response = history(room_id=room_id, **params).json()
+        if not response.get('success', True):
+            raise RuntimeError(f"Failed to fetch history of RocketChat room {room_id}: {response.get('error')}")
+        page = response.get('messages') or []
+        # messages posted while paging shift the offsets, which only repeats messages
+        new = [message for message in page if message.get('_id') not in seen]
+        seen.update(message.get('_id') for message in new)
+        return new, offset + len(page) if len(page) == page_size else None
+
+    return _iter_pages(fetch_page, 0)
+
+
+def compile_keyword_matcher(keywords):
+    """
+    Return a function telling whether a text contains all keywords (case-insensitive),
+    checking all of them in a single scan of the text, which stops as soon as the last
+    keyword is found.
+    """
+    keywords = {keyword.lower() for keyword in keywords}
+    if not keywords:
+        return lambda text: True
+    # the lookahead matches at every position, longest keyword first, so a keyword is only
+    # missed where a longer keyword starting with it matches
+    pattern = re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)) + '))',
+                         re.IGNORECASE | re.DOTALL)
+
+    def matches(text):
+        remaining = set(keywords)
+        for match in pattern.finditer(text or ''):
+            found = match.group(1).lower()
+            remaining = {keyword for keyword in remaining if not found.startswith(keyword)}
+            if not remaining:
+                return True
+        return False
+    return matches
+
+
+class RocketChatHistoryStore:
+    """
+    In-memory view of all direct messages, channels and private groups that a RocketChat
+    account can see. sync() lists the rooms and fetches, concurrently, only the messages
+    posted after the newest one already stored in each room, so chat helpers share one
+    pass over the server instead of each fetching the histories they need.
+
+    Messages are kept oldest first, and indexed by room, by sender and by keyword.
+    Use get_rocketchat_history_store to get the store shared by all helpers.
+    """
+
+    def __init__(self, rocket_client, page_size: int = None, min_sync_interval: float = None):
+        self.rocket_client = rocket_client
+        self.page_size = page_size or ROCKETCHAT_HISTORY_PAGE_SIZE
+        self.min_sync_interval = ROCKETCHAT_SYNC_INTERVAL if min_sync_interval is None else min_sync_interval
+        self.rooms = {}
+        self._messages = {}
+        self._message_ids = set()
+        # room id -> timestamp of the newest stored message, passed as oldest= on the next sync
+        self._cursors = {}
+        self._by_user = {}
+        self._by_keyword = {}
+        self._username = None
+        self._last_sync = None
+        self._lock = threading.RLock()
+
+    def sync(self, force: bool = False):
+        """Fetch new rooms and messages, unless the last sync was less than min_sync_interval ago"""
+        with self._lock:
+            if not force and self._last_sync is not None and time.monotonic() - self._last_sync < self.min_sync_interval:
+                return self
+            if self._username is None:
+                self._username = self.rocket_client.me().json().get('username')
+
+            rooms = self._list_rooms()
+            with ThreadPoolExecutor(max_workers=ROCKETCHAT_SYNC_WORKERS) as executor:
+                # rooms are fetched with the caller's context, so that they count towards its metrics
+                futures = {room['_id']: executor.submit(contextvars.copy_context().run, self._fetch_new_messages, room)
+                           for room in rooms}
+            for room in rooms:
+                self.rooms[room['_id']] = room
+                self._messages.setdefault(room['_id'], [])
+                try:
+                    self._add_messages(room['_id'], futures[room['_id']].result())
+                except Exception as e:
+                    logging.warning(f"Failed to sync messages of RocketChat room {room.get('name') or room['_id']}: {e}")
+            self._last_sync = time.monotonic()
+            logging.info(f"Synced {len(self._message_ids)} messages in {len(self.rooms)} RocketChat rooms")
+            return self
+
+    def _list_rooms(self):
+        rooms = []
+        for room_type, (list_method, key, _) in ROCKETCHAT_ROOM_TYPES.items():
+            offset = 0
+            while True:
+                response = getattr(self.rocket_client, list_method)(count=self.page_size, offset=offset).json()
+                if not response.get('success', True):
+                    logging.warning(f"Failed to list RocketChat rooms with {list_method}: {response.get('error')}")
+                    break
+                page = response.get(key) or []
+                rooms.extend({**room, 't': room.get('t', room_type)} for room in page)
+                offset += len(page)
+                if len(page) < self.page_size or offset >= response.get('total', offset):
+                    break
+        return rooms
+
+    def _fetch_new_messages(self, room):
+        """Fetch the messages posted in a room since the last sync"""
+        return list(iter_rocketchat_room_history(self.rocket_client, room['_id'], room['t'],
+                                                 oldest=self._cursors.get(room['_id']), page_size=self.page_size))
+
+    def _add_messages(self, room_id, messages):
+        stored = self._messages[room_id]
+        for msg in sorted(messages, key=lambda m: m.get('ts', '')):
+            if msg.get('_id') in self._message_ids:
+                continue
+            self._message_ids.add(msg.get('_id'))
+            stored.append(msg)
+            ref = (room_id, len(stored) - 1)
+            sender = msg.get('u', {}).get('username')
+            if sender:
+                self._by_user.setdefault(sender.lower(), []).append(ref)
+            for word in set(re.findall(r'\w+', msg.get('msg', '').lower())):
+                self._by_keyword.setdefault(word, set()).add(ref)
+            self._cursors[room_id] = msg.get('ts', self._cursors.get(room_id))
+
+    def room_messages(self, room_id):
+        """Messages of a room, oldest first"""
+        with self._lock:
+            return list(self._messages.get(room_id, []))
+
+    def direct_message_room_id(self, username: str):
+        """Id of the direct message room with the given user, or None if they never talked"""
+        with self._lock:
+            for room_id, room in self.rooms.items():
+                others = [name for name in room.get('usernames', []) if name != self._username]
+                if room['t'] == 'd' and len(others) == 1 and others[0].lower() == username.lower():
+                    return room_id
+        return None
+
+    def channel_room_id(self, channel_name: str):
+        """Id of the channel or private group with the given name, or None if there is no such room"""
+        with self._lock:
+            for room_id, room in self.rooms.items():
+                if room['t'] in ('c', 'p') and room.get('name') == channel_name:
+                    return room_id
+        return None
+
+    def direct_messages(self, username: str):
+        """Messages exchanged with the given user, oldest first, or None if there is no such room"""
+        room_id = self.direct_message_room_id(username)
+        return None if room_id is None else self.room_messages(room_id)
+
+    def channel_messages(self, channel_name: str):
+        """Messages of the given channel, oldest first, or None if there is no such channel"""
+        room_id = self.channel_room_id(channel_name)
+        return None if room_id is None else self.room_messages(room_id)
+
+    def messages_from(self, username: str):
+        """Messages sent by the given user in any room, in the order they were stored"""
+        with self._lock:
+            return [self._messages[room_id][index] for room_id, index in self._by_user.get(username.lower(), [])]
+
+    def search(self, keywords, room_id=None):
+        """
+        Messages, oldest first within each room, that contain all keywords (case-insensitive),
+        optionally only in the given room. The keyword index narrows down the messages to
+        check, and the full text is then matched, so keywords also match within words.
+        """
+        keywords = [keyword.lower() for keyword in keywords]
+        matches = compile_keyword_matcher(keywords)
+        with self._lock:
+            candidates = None
+            for keyword in keywords:
+                for token in re.findall(r'\w+', keyword):
+                    refs = set()
+                    for word, word_refs in self._by_keyword.items():
+                        if token in word:
+                            refs |= word_refs
+                    candidates = refs if candidates is None else candidates & refs
+            if candidates is None:
+                candidates = {(rid, index) for rid, msgs in self._messages.items() for index in range(len(msgs))}
+            return [self._messages[rid][index] for rid, index in sorted(candidates)
+                    if (room_id is None or rid == room_id)
+                    and matches(self._messages[rid][index].get('msg', ''))]
+
+
+_rocketchat_history_stores = {}
+_rocketchat_history_stores_lock = threading.Lock()
+
+
+def get_rocketchat_history_store(rocket_client, sync: bool = True):
+    """
+    Get the RocketChat history store of the given client, shared by all chat helpers in
+    this process, synced with the server unless sync is False.
+    """
+    with _rocketchat_history_stores_lock:
+        if rocket_client not in _rocketchat_history_stores:
+            _rocketchat_history_stores[rocket_client] = RocketChatHistoryStore(rocket_client)
+        store = _rocketchat_history_stores[rocket_client]
+    return store.sync() if sync else store
+
+
+def clear_rocketchat_history_stores():
+    """Forget all synced RocketChat messages, e.g. after the server has been reset"""
+    with _rocketchat_history_stores_lock:
+        _rocketchat_history_stores.clear()
+
+
 def get_rocketchat_personal_chat_history(rocket_client, username: str, content_only: bool = True):
     """
     Get chat history from RocketChat server, between:
@@ -90,22 +815,20 @@ def get_rocketchat_personal_chat_history(rocket_client, username: str, content_o
 
     Returns the messages as a list. If no history, returns an empty list.
     """
-    id = None
-    for item in rocket_client.users_list().json()['users']:
-        if item.get('nameInsensitive', '').lower() == username.lower() or item.get('username', '').lower() == username.lower():
-            id = item["_id"]
-            break
-
-    if id is None:
-        logging.error(f'Cannot fetch chat history for {username}')
-        return []
-
-    msgs = rocket_client.im_history(room_id=id).json()['messages']
+    store = get_rocketchat_history_store(rocket_client)
+    msgs = store.direct_messages(username)
+    if msgs is None:
+        # a display name may be given instead of the username
+        user = get_rocketchat_user(rocket_client, username)
+        if user is None:
+            logging.error(f'Cannot fetch chat history for {username}')
+            return []
+        if user.get('username', '').lower() != username.lower():
+            msgs = store.direct_messages(user['username'])
+
+    history = [] if msgs is None else msgs
     if content_only:
-        reversed_history = [] if msgs is None else [msg['msg'] for msg in msgs]
-    else:
-        reversed_history = [] if msgs is None else msgs
-    history = reversed_history[::-1]
+        history = [msg['msg'] for msg in history]
     logging.info(f'Chat history with {username} is: {history}')
     return history
 
@@ -120,14 +843,8 @@ def num_rocketchat_users_contacted(rocket_client, users):
     Returns:
         int: Number of users contacted
     """
-    contacted_users = 0
-    user_list = rocket_client.users_list().json()
-    for item in user_list['users']:
-        if item.get('username') in users:
-            id = item["_id"]
-            msgs = rocket_client.im_history(room_id=id).json()['messages']
-            contacted_users += msgs is not None and len(msgs) > 0
-    return contacted_users
+    store = get_rocketchat_history_store(rocket_client)
+    return sum(1 for username in set(users) if store.direct_messages(username))
 
 def get_rocketchat_channel_history(rocket_client, channel):
     """
@@ -146,25 +863,17 @@ def get_rocketchat_channel_history(rocket_client, channel):
         >>> for message in messages:
         >>>     print(message["msg"])
     """
-    response = rocket_client.channels_info(channel=channel).json()
-    if not response.get('success'):
+    messages = get_rocketchat_history_store(rocket_client).channel_messages(channel)
+    if messages is None:
         logging.warning(f"Failed to retrieve {channel} channel info.")
         return []
 
-    room_id = response['channel']['_id']
-
-    response = rocket_client.channels_history(room_id=room_id).json()
-    if not response.get('success'):
-        logging.warning("Failed to retrieve message history.")
-        return []
-
-    messages = response.get('messages', [])
-
     if not messages:
         logging.warning("No messages found.")
         return []
 
-    return messages
+    # newest first, like the channels.history API
+    return messages[::-1]
 
 def get_rocketchat_channel_room_id(rocket_client, channel_name):
     """Get the room_id for a specific channel."""
@@ -187,18 +896,14 @@ def check_rocketchat_message_posted(rocket_client, channel_name, keywords):
     room_id = get_rocketchat_channel_room_id(rocket_client, channel_name)
     if not room_id:
         return False
-    
-    messages = rocket_client.channels_history(room_id=room_id, count=10).json().get('messages', [])
-    for message in messages:
-        message_text = message.get("msg", "").lower()
-        # Check if all keywords are present in the message text
-        if all(keyword.lower() in message_text for keyword in keywords):
-            return True
-    return False
+
+    # walk the whole history backward, stopping at the first matching message
+    matches = compile_keyword_matcher(keywords)
+    return any(matches(message.get('msg', '')) for message in iter_rocketchat_room_history(rocket_client, room_id))
 
 def download_image_from_url(image_url, output_file_path):
     try:
-        response = requests.get(image_url)
+        response = default_session.get(image_url)
         if response.status_code == 200:
             with open(output_file_path, "wb") as file:
                 file.write(response.content)
@@ -211,16 +916,66 @@ def download_image_from_url(image_url, output_file_path):
         logging.error(f"Failed to download image from {image_url}: {e}")
         return None
 
-def evaluate_with_llm(content: str, predicate: str, additional_prompt: str = '', image_path: str = None, image_type: str = IMAGE_JPEG):
+_encoded_images = {}
+_encoded_images_lock = threading.Lock()
+
+
+def encode_image_for_llm(image_path: str, image_type: str = IMAGE_JPEG):
     """
-    Evaluates if a predicate can be inferred from the content/image, judged by LLM
+    Read an image and prepare it for a multimodal LLM request: downscale it so that
+    its longest edge is at most LLM_IMAGE_MAX_EDGE pixels, and re-encode it as JPEG.
+    If Pillow is not installed, or re-encoding doesn't make the image smaller, the
+    original bytes are used with the given image_type. Results are cached by file
+    content hash, so the same image is only processed once per process.
+
+    Returns a tuple of the image type and the base64 encoded image.
+    Raises OSError if the image cannot be read.
+    """
+    with open(image_path, "rb") as f:
+        raw = f.read()
+    key = (hashlib.sha256(raw).hexdigest(), image_type, LLM_IMAGE_MAX_EDGE, LLM_IMAGE_QUALITY)
+    with _encoded_images_lock:
+        if key in _encoded_images:
+            return _encoded_images[key]
+
+    encoded_type, encoded = image_type, raw
+    if Image is not None and LLM_IMAGE_MAX_EDGE > 0:
+        try:
+            with Image.open(BytesIO(raw)) as img:
+                img.thumbnail((LLM_IMAGE_MAX_EDGE, LLM_IMAGE_MAX_EDGE))
+                if img.mode in ('RGBA', 'LA', 'P'):
+                    # JPEG has no alpha channel, so flatten transparent parts onto white
+                    img = img.convert('RGBA')
+                    background = Image.new('RGB', img.size, (255, 255, 255))
+                    background.paste(img, mask=img.getchannel('A'))
+                    img = background
+                elif img.mode != 'RGB':
+                    img = img.convert('RGB')
+                buffer = BytesIO()
+                img.save(buffer, format='JPEG', quality=LLM_IMAGE_QUALITY, optimize=True)
+            if buffer.tell() < len(raw):
+                encoded_type, encoded = IMAGE_JPEG, buffer.getvalue()
+        except Exception as e:
+            logging.warning(f"Failed to re-encode image {image_path}, sending it as it is: {e}")
+    logging.info(f"Image {image_path} is {len(raw)} bytes, {len(encoded)} bytes after re-encoding")
+
+    result = (encoded_type, base64.b64encode(encoded).decode('utf-8'))
+    with _encoded_images_lock:
+        _encoded_images[key] = result
+    return result
+
+
+def _build_evaluation_messages(content: str, predicate: str, additional_prompt: str = '', image_path: str = None, image_type: str = IMAGE_JPEG):
+    """
+    Build the LLM messages asking whether a predicate can be inferred from the content/image.
+    Returns None if the input is invalid.
     """
     if image_path is not None and image_type not in [IMAGE_JPEG, IMAGE_PNG]:
         logging.warning(f"Invalid image type: {image_type}")
-        return False
+        return None
     if not content and not image_path:
         logging.warning(f"Both content and image are empty, cannot evaluate")
-        return False
+        return None
     elif content and image_path:
         query = f'Does the content """{content}""" and following picture indicate {predicate}?'
     elif content:
@@ -237,11 +992,10 @@ def evaluate_with_llm(content: str, predicate: str, additional_prompt: str = '',
     ]
     if image_path:
         try:
-            with open(image_path, "rb") as f:
-                base64_image = base64.b64encode(f.read()).decode('utf-8')
+            image_type, base64_image = encode_image_for_llm(image_path, image_type)
         except Exception as e:
             logging.error(f"Failed to read image from {image_path}: {e}")
-            return False
+            return None
         content.append({
             "type": "image_url",
             "image_url": {
@@ -249,28 +1003,41 @@ def evaluate_with_llm(content: str, predicate: str, additional_prompt: str = '',
             }
         })
 
-    try:
-        # Construct LLM query
-        llm_messages = [{
-            "role": "user",
-            "content": content
-        }]
+    return [{
+        "role": "user",
+        "content": content
+    }]
 
-        # Call LLM for evaluation
-        llm_response = llm_complete(llm_messages)
-        logging.info("LLM evaluation completed", extra={"response": llm_response})
 
-        # Extract and process response
-        content = llm_response["choices"][0]["message"]["content"].lower().strip()
+def _parse_evaluation_response(llm_response, predicate: str) -> bool:
+    """Interpret a yes/no LLM answer built by _build_evaluation_messages"""
+    logging.info("LLM evaluation completed", extra={"response": llm_response})
 
-        # Evaluate result
-        result = "yes" in content
-        if result:
-            logging.info(f'Predicate "{predicate}" evaluated to "{result}"')
-        else:
-            logging.warning(f'Predicate "{predicate}" evaluated to "{result}"')
+    # Extract and process response
+    content = llm_response["choices"][0]["message"]["content"].lower().strip()
 
-        return result
+    # Evaluate result
+    result = "yes" in content
+    if result:
+        logging.info(f'Predicate "{predicate}" evaluated to "{result}"')
+    else:
+        logging.warning(f'Predicate "{predicate}" evaluated to "{result}"')
+
+    return result
+
+
+def evaluate_with_llm(content: str, predicate: str, additional_prompt: str = '', image_path: str = None, image_type: str = IMAGE_JPEG):
+    """
+    Evaluates if a predicate can be inferred from the content/image, judged by LLM
+    """
+    llm_messages = _build_evaluation_messages(content, predicate, additional_prompt, image_path, image_type)
+    if llm_messages is None:
+        return False
+
+    try:
+        # Call LLM for evaluation
+        llm_response = llm_complete(llm_messages)
+        return _parse_evaluation_response(llm_response, predicate)
 
     except KeyError as e:
         logging.error("Invalid LLM response structure", exc_info=True)
@@ -281,6 +1048,170 @@ def evaluate_with_llm(content: str, predicate: str, additional_prompt: str = '',
         return False
 
 
+def evaluate_many_with_llm(items, concurrency: int = None):
+    """
+    Evaluates many predicates concurrently, judged by LLM. Each item is either a tuple
+    of evaluate_with_llm's positional arguments, e.g. (content, predicate), or a dict
+    of its keyword arguments. At most `concurrency` requests (LLM_CONCURRENCY by
+    default) are in flight at a time.
+
+    Returns a list of booleans, in the same order as items. Like evaluate_with_llm,
+    an item that cannot be evaluated yields False.
+
+    Example:
+        >>> evaluate_many_with_llm([
+        ...     (report, "the report mentions the Q3 revenue"),
+        ...     {"content": email, "predicate": "the email is polite"},
+        ... ])
+        [True, False]
+    """
+    semaphore = asyncio.Semaphore(concurrency or LLM_CONCURRENCY)
+
+    async def evaluate(item):
+        kwargs = item if isinstance(item, dict) else dict(zip(('content', 'predicate', 'additional_prompt', 'image_path', 'image_type'), item))
+        llm_messages = _build_evaluation_messages(**kwargs)
+        if llm_messages is None:
+            return False
+        try:
+            async with semaphore:
+                llm_response = await llm_acomplete(llm_messages)
+            return _parse_evaluation_response(llm_response, kwargs['predicate'])
+        except KeyError as e:
+            logging.error("Invalid LLM response structure", exc_info=True)
+            return False
+        except Exception as e:
+            logging.error(f"Failed to evaluate message: {str(e)}", exc_info=True)
+            return False
+
+    async def evaluate_all():
+        return await asyncio.gather(*(evaluate(item) for item in items))
+
+    return asyncio.run(evaluate_all())
+
+
+_STOPWORDS = {'the', 'and', 'that', 'this', 'with', 'from', 'there', 'their', 'they', 'have', 'has', 'had',
+              'was', 'were', 'is', 'are', 'for', 'about', 'into', 'some', 'someone', 'person', 'examinee', 'whether'}
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens of text for LITELLM_MODEL, or a rough estimate if the tokenizer is unavailable"""
+    try:
+        return litellm.token_counter(model=LITELLM_MODEL, text=text)
+    except Exception:
+        return len(text) // 4 + 1
+
+
+def format_chat_messages(messages) -> list:
+    """Turn RocketChat message objects into "sender: text" lines, skipping empty messages"""
+    lines = []
+    for msg in messages:
+        text = (msg.get('msg') or '').strip()
+        if not text:
+            continue
+        user = msg.get('u') or {}
+        sender = user.get('name') or user.get('username') or 'unknown'
+        lines.append(f"{sender}: {text}")
+    return lines
+
+
+def truncate_chat_history(lines: list, predicate: str, token_budget: int = None) -> str:
+    """
+    Fit chat lines (oldest first) into token_budget tokens. Lines mentioning keywords of
+    the predicate are kept first, then the most recent lines fill up the rest of the
+    budget. Kept lines stay in chronological order, and gaps are marked with "...".
+    """
+    token_budget = token_budget or CHAT_HISTORY_TOKEN_BUDGET
+    tokens = [count_tokens(line) for line in lines]
+    if sum(tokens) <= token_budget:
+        return '\n'.join(lines)
+
+    keywords = {word for word in re.findall(r'\w+', predicate.lower()) if len(word) > 2 and word not in _STOPWORDS}
+    relevant = [i for i, line in enumerate(lines) if any(keyword in line.lower() for keyword in keywords)]
+    recent = range(len(lines) - 1, -1, -1)
+
+    kept = set()
+    used = 0
+    # relevant messages may use up to half of the budget, most recent ones first
+    for budget, candidates in ((token_budget // 2, reversed(relevant)), (token_budget, recent)):
+        for i in candidates:
+            if i not in kept and used + tokens[i] <= budget:
+                kept.add(i)
+                used += tokens[i]
+
+    history = []
+    for i in sorted(kept):
+        if i > 0 and i - 1 not in kept:
+            history.append('...')
+        history.append(lines[i])
+    logging.info(f"Chat history truncated from {len(lines)} to {len(kept)} messages")
+    return '\n'.join(history)
+
+
+def summarize_chat_history(lines: list, predicate: str, token_budget: int = None) -> str:
+    """
+    Map-reduce summarization of a long chat history: split the lines into chunks that fit
+    into token_budget tokens, summarize all chunks concurrently with respect to the
+    predicate, and join the summaries. Falls back to truncating the joined summaries if
+    they are still too long.
+    """
+    token_budget = token_budget or CHAT_HISTORY_TOKEN_BUDGET
+    chunks, chunk, used = [], [], 0
+    for line in lines:
+        line_tokens = count_tokens(line)
+        if chunk and used + line_tokens > token_budget:
+            chunks.append(chunk)
+            chunk, used = [], 0
+        chunk.append(line)
+        used += line_tokens
+    if chunk:
+        chunks.append(chunk)
+
+    async def summarize(chunk):
+        text = '\n'.join(chunk)
+        llm_response = await llm_acomplete([{
+            "role": "user",
+            "content": f'Summarize the following part of a chat conversation. Keep who said what, and keep '
+                       f'all details that could tell whether {predicate}.\n"""{text}"""'
+        }])
+        return llm_response["choices"][0]["message"]["content"].strip()
+
+    async def summarize_all():
+        semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+
+        async def bounded(chunk):
+            async with semaphore:
+                return await summarize(chunk)
+        return await asyncio.gather(*(bounded(chunk) for chunk in chunks))
+
+    summaries = asyncio.run(summarize_all())
+    logging.info(f"Chat history of {len(lines)} messages summarized in {len(chunks)} chunks")
+    return truncate_chat_history([f"Part {i + 1}: {summary}" for i, summary in enumerate(summaries)], predicate, token_budget)
+
+
+def build_chat_history_for_llm(messages, predicate: str, token_budget: int = None, summarize: bool = None) -> str:
+    """
+    Build a compact, token-budgeted text of a RocketChat chat history for LLM evaluation.
+
+    Args:
+        messages: RocketChat message objects, oldest first
+        predicate: The condition the history will be evaluated against, used to pick relevant messages
+        token_budget: Maximum number of tokens, CHAT_HISTORY_TOKEN_BUDGET by default
+        summarize: Summarize long histories instead of truncating them, CHAT_HISTORY_SUMMARIZE by default
+
+    Returns:
+        str: One "sender: text" line per message
+    """
+    lines = format_chat_messages(messages)
+    token_budget = token_budget or CHAT_HISTORY_TOKEN_BUDGET
+    summarize = CHAT_HISTORY_SUMMARIZE if summarize is None else summarize
+    if summarize and sum(count_tokens(line) for line in lines) > token_budget:
+        try:
+            return summarize_chat_history(lines, predicate, token_budget)
+        except Exception as e:
+            logging.warning(f"Failed to summarize chat history, truncating it instead: {e}")
+    return truncate_chat_history(lines, predicate, token_budget)
+
+
 def evaluate_chat_history_with_llm(rocket_client, username: str, predicate: str):
     """
     Evaluates chat history from RocketChat server against a given predicate using LLM.
@@ -302,12 +1233,12 @@ def evaluate_chat_history_with_llm(rocket_client, username: str, predicate: str)
     """
     try:
         # Retrieve chat history
-        messages = get_rocketchat_personal_chat_history(rocket_client, username)
+        messages = get_rocketchat_personal_chat_history(rocket_client, username, content_only=False)
         if not messages:
             logging.warning(f"No chat history found for user: {username}")
             return False
-        
-        return evaluate_with_llm(str(messages), predicate)
+
+        return evaluate_with_llm(build_chat_history_for_llm(messages, predicate), predicate)
 
     except Exception as e:
         logging.error(f"Failed to evaluate chat history for user {username}: {str(e)}", exc_info=True)
@@ -325,12 +1256,62 @@ def make_gitlab_request(project_identifier: str = None, additional_path: str = N
         url = f"{url}/{additional_path}"
     
     try:
-        response = requests.request(method, url, headers=GITLAB_HEADERS, params=params)
+        if method.upper() == 'GET':
+            return _gitlab_get(url, params)
+        # anything else may change gitlab state
+        clear_read_cache()
+        response = gitlab_session.request(method, url, params=params)
         return response
     except Exception as e:
         logging.error(f"GitLab API request failed: {e}")
         return None
 
+@read_cached(cache_if=lambda response: response.ok)
+def _gitlab_get(url: str, params: dict = None):
+    return gitlab_session.get(url, params=params)
+
+def _iter_pages(fetch_page, first_page):
+    """
+    Yield the items of all pages, starting from first_page. fetch_page(page) returns
+    the items of that page along with the next page, or None if it is the last one.
+    The next page is fetched in the background while the caller consumes the current
+    one, and nothing more is fetched once the caller stops iterating.
+    """
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        # pages are fetched with the caller's context, so that they count towards its metrics
+        future = executor.submit(contextvars.copy_context().run, fetch_page, first_page)
+        while future is not None:
+            items, next_page = future.result()
+            future = executor.submit(contextvars.copy_context().run, fetch_page, next_page) if next_page is not None else None
+            yield from items
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def iter_gitlab(path: str, params: dict = None, per_page: int = 100):
+    """
+    Iterate over all items of a paginated GitLab list endpoint, e.g. "projects" or
+    "projects/1/merge_requests". Follows the X-Next-Page header, or the Link header
+    when GitLab doesn't return the former.
+
+    Raises requests.RequestException if a page cannot be fetched.
+    """
+    def fetch_page(page):
+        url, page_params = page
+        response = _gitlab_get(url, page_params)
+        response.raise_for_status()
+        if response.headers.get('X-Next-Page'):
+            next_page = (url, dict(page_params or {}, page=response.headers['X-Next-Page']))
+        elif 'next' in response.links:
+            next_page = (response.links['next']['url'], None)
+        else:
+            next_page = None
+        return response.json(), next_page
+
+    url = f"{GITLAB_BASEURL}/api/v4/{path}"
+    return _iter_pages(fetch_page, (url, dict(params or {}, per_page=per_page)))
+
+@read_cached
 def get_gitlab_project_id(project_name:str):
     """
     Get project ID for gitlab project
@@ -342,18 +1323,20 @@ def get_gitlab_project_id(project_name:str):
         str: The ID of the project
 
     """
-    projects = make_gitlab_request(None,"projects")
-    if not projects:
-        logging.warning(f"No gitlab projects found")
-        return None
-    else:
-        projects = projects.json()
-    target_projects = [project['id'] for project in projects if project['name']==project_name]
-    if len(target_projects) == 0:
-        logging.warning(f"No gitlab projects found for project name {project_name}")
+    try:
+        # search matches names as substrings, so an exact match is always among the results
+        for project in iter_gitlab("projects", {"search": project_name}):
+            if project['name'] == project_name:
+                return str(project['id'])
+        # search may be restricted, e.g. for very short names, so fall back to a full scan
+        for project in iter_gitlab("projects"):
+            if project['name'] == project_name:
+                return str(project['id'])
+    except Exception as e:
+        logging.warning(f"No gitlab projects found: {e}")
         return None
-    else:
-        return str(target_projects[0])
+    logging.warning(f"No gitlab projects found for project name {project_name}")
+    return None
 
 def get_gitlab_merge_request_by_title(project_id:str, merge_request_title:str):
     """
@@ -366,18 +1349,16 @@ def get_gitlab_merge_request_by_title(project_id:str, merge_request_title:str):
     Returns:
         dict: The merge request object
     """
-    merge_requests = make_gitlab_request(project_id,"merge_requests")
-    if not merge_requests:
-        logging.warning(f"No gitlab merge requests found")
-        return None
-    else:
-        merge_requests = merge_requests.json()
-    target_merge_requests = [merge_request for merge_request in merge_requests if merge_request['title'].strip().lower()==merge_request_title.strip().lower()]
-    if len(target_merge_requests) == 0:
-        logging.warning(f"No gitlab merge requests found for title {merge_request_title}")
+    project_id = urllib.parse.quote(str(project_id), safe='')
+    try:
+        for merge_request in iter_gitlab(f"projects/{project_id}/merge_requests"):
+            if merge_request['title'].strip().lower() == merge_request_title.strip().lower():
+                return merge_request
+    except Exception as e:
+        logging.warning(f"No gitlab merge requests found: {e}")
         return None
-    else:
-        return target_merge_requests[0]
+    logging.warning(f"No gitlab merge requests found for title {merge_request_title}")
+    return None
 
 def get_gitlab_file_in_mr(mr: dict, file_path: str) -> str:
     """
@@ -413,6 +1394,116 @@ def get_owncloud_url_in_file(filename: str):
         logging.error(f"Error: An I/O error occurred. Details: {e}")
         return False
 
+def resolve_owncloud_share_link(link: str):
+    """
+    Get the direct download link of a share link generated by ownCloud, e.g.
+    http://the-agent-company.com:8092/index.php/s/<token>. Returns None if it cannot be found.
+    """
+    link = link.strip()
+    if "download" in link:
+        return link
+    # public share links have a well-known download endpoint
+    if re.search(r'/s/\w+/?$', link):
+        return f"{link.rstrip('/')}/download"
+
+    # otherwise look up the download link in the share page
+    try:
+        response = default_session.get(link)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logging.warning(f"Unable to download from link: {link} due to {e}")
+        return None
+    matches = re.findall(r'https?://[^\s]*\bdownload\b[^\s]*(?=")', response.text, re.MULTILINE)
+    if not matches:
+        logging.warning(f"Did not find proper download link")
+        return None
+    return matches[0]
+
+
+class _Adler32:
+    """hashlib-like wrapper of zlib.adler32, one of the checksums ownCloud supports"""
+
+    def __init__(self):
+        self.value = 1
+
+    def update(self, data):
+        self.value = zlib.adler32(data, self.value)
+
+    def hexdigest(self):
+        return f"{self.value:08x}"
+
+
+def _checksum_hasher(oc_checksum: str):
+    """
+    Create a hasher for a checksum announced by ownCloud in the OC-Checksum header,
+    e.g. "SHA1:<hex>". Returns the hasher and the expected hex digest, or (None, None)
+    if the algorithm is not supported.
+    """
+    algorithm, _, expected = oc_checksum.split(' ')[0].partition(':')
+    algorithm = algorithm.lower()
+    if algorithm == 'adler32':
+        return _Adler32(), expected.lower()
+    if algorithm in ('sha1', 'md5', 'sha256'):
+        return hashlib.new(algorithm), expected.lower()
+    return None, None
+
+
+def stream_owncloud_file(url: str, destination, session: requests.Session = None, byte_range: tuple = None,
+                         chunk_size: int = 1024 * 1024) -> bool:
+    """
+    Stream a file from ownCloud in chunks, without holding it in memory.
+
+    Args:
+        url: WebDAV or direct download URL of the file
+        destination: path to save the file to, or a writable file object, e.g. BytesIO
+        session: session to use, owncloud_session (authenticated WebDAV access) by default
+        byte_range: optional (start, end) tuple to only download bytes start to end, inclusive
+        chunk_size: size of the chunks to read
+
+    Returns:
+        bool: True if the file was downloaded, and its checksum matched if ownCloud sent one
+    """
+    session = session or owncloud_session
+    headers = {'Range': f"bytes={byte_range[0]}-{byte_range[1]}"} if byte_range else {}
+    try:
+        with session.get(url, headers=headers, stream=True) as response:
+            if response.status_code not in (200, 206):
+                logging.error(f"Failed to download {url}. HTTP Status: {response.status_code}")
+                return False
+            # checksums cover the whole file, so they can't verify partial content
+            hasher, expected = (None, None)
+            if response.status_code == 200 and response.headers.get('OC-Checksum'):
+                hasher, expected = _checksum_hasher(response.headers['OC-Checksum'])
+
+            if isinstance(destination, (str, os.PathLike)):
+                # write to a temporary file first, so that no partial file is left behind
+                partial_path = f"{destination}.part"
+                output = open(partial_path, 'wb')
+            else:
+                partial_path = None
+                output = destination
+            try:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    output.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+            finally:
+                if partial_path:
+                    output.close()
+
+            if hasher is not None and hasher.hexdigest() != expected:
+                logging.error(f"Checksum mismatch for {url}: expected {expected}, got {hasher.hexdigest()}")
+                if partial_path:
+                    os.remove(partial_path)
+                return False
+            if partial_path:
+                os.replace(partial_path, destination)
+            return True
+    except (requests.RequestException, OSError) as e:
+        logging.warning(f"Failed to download {url}: {e}")
+        return False
+
+
 def download_owncloud_content(link: str, output_file_path: str):
     """
     link: Share link generated by ownCloud
@@ -421,33 +1512,13 @@ def download_owncloud_content(link: str, output_file_path: str):
     if not link:
         return False
 
-    if "download" not in link:
-        command = ["curl", "--output", "/tmp/.tmp_download_link", link.rstrip("\n")]
-        try:
-            subprocess.run(command, capture_output=True, text=True, check=True)
-        except Exception as e:
-            logging.warning(f"Unable to download from link: {link} due to {e}")
-            return False
-
-        pattern = r'https?://[^\s]*\bdownload\b[^\s]*(?=")'
-
-        download_link: str | None = None
-        with open("/tmp/.tmp_download_link", "r") as f:
-            content = f.read()
-            matches = re.findall(pattern, content, re.MULTILINE)
-            if matches:
-               download_link = matches[0]
-
-        if download_link is None:
-            logging.warning(f"Did not find proper download link")
-            return False
-    else:
-        download_link = link.rstrip("\n")
+    download_link = resolve_owncloud_share_link(link)
+    if download_link is None:
+        return False
 
-    try:
-        logging.info(download_link)
-        subprocess.run([f"curl {download_link} --output {output_file_path}"], shell=True)
-    except Exception as e:
+    logging.info(download_link)
+    # share links are public, so credentials are not needed
+    if not stream_owncloud_file(download_link, output_file_path, session=default_session):
         logging.warning(f"Download from link: {download_link} not successful")
         return False
 
@@ -474,11 +1545,10 @@ def check_and_download_file(file_name, dir_name, output_file_path):
 
     try:
         # Check if the file exists in the directory
-        response = requests.request(
+        response = owncloud_session.request(
             method="PROPFIND",
             url=server_url,
-            headers=headers,
-            auth=HTTPBasicAuth(OWNCLOUD_USERNAME, OWNCLOUD_PASSWORD)
+            headers=headers
         )
 
         if response.status_code == 207:
@@ -493,20 +1563,11 @@ def check_and_download_file(file_name, dir_name, output_file_path):
                     file_url = server_url + file_name
 
                     # Download the file
-                    download_response = requests.get(
-                        file_url,
-                        auth=HTTPBasicAuth(OWNCLOUD_USERNAME, OWNCLOUD_PASSWORD),
-                        stream=True
-                    )
-
-                    if download_response.status_code == 200:
-                        with open(output_file_path, "wb") as file:
-                            for chunk in download_response.iter_content(chunk_size=8192):
-                                file.write(chunk)
+                    if stream_owncloud_file(file_url, output_file_path):
                         logging.info(f"File '{file_name}' downloaded successfully to '{output_file_path}'.")
                         return True
                     else:
-                        logging.error(f"Failed to download file '{file_name}'. HTTP Status: {download_response.status_code}")
+                        logging.error(f"Failed to download file '{file_name}'.")
                         return False
 
             # File not found in the directory
@@ -533,11 +1594,10 @@ def check_file_in_owncloud_directory(file_name, dir_name):
     }
 
     try:
-        response = requests.request(
+        response = owncloud_session.request(
             method="PROPFIND",
-        url=server_url,
-        headers=headers,
-        auth=HTTPBasicAuth(OWNCLOUD_USERNAME, OWNCLOUD_PASSWORD)
+            url=server_url,
+            headers=headers
         )
     except requests.RequestException as e:
         logging.warning(f"Failed to check file in owncloud directory: {e}")
@@ -556,22 +1616,18 @@ def check_file_in_owncloud_directory(file_name, dir_name):
         logging.error(f"Error: {response.status_code}, {response.text}")
         return None
 
-def get_binary_file_content_owncloud(file_name, dir_name):
+def get_binary_file_content_owncloud(file_name, dir_name, byte_range: tuple = None):
+    """
+    Get the content of a file in ownCloud as bytes, or None if it cannot be downloaded.
+    If byte_range is given as (start, end), only these bytes (inclusive) are fetched.
+    """
     server_url = f"{OWNCLOUD_URL}/remote.php/webdav/{dir_name}/{file_name}"
 
-    try:
-        response = requests.get(
-            server_url, 
-        auth=HTTPBasicAuth(OWNCLOUD_USERNAME, OWNCLOUD_PASSWORD)
-        )
-    except requests.RequestException as e:
-        logging.warning(f"Failed to get binary file content from owncloud: {e}")
-        return None
-
-    if response.status_code == 200:
-        return response.content
-    else:
+    buffer = BytesIO()
+    if not stream_owncloud_file(server_url, buffer, byte_range=byte_range):
+        logging.warning(f"Failed to get binary file content from owncloud: {server_url}")
         return None
+    return buffer.getvalue()
     
 
 # Use the unique file name to check if the repository is cloned correctly.
@@ -597,26 +1653,44 @@ def check_repo_exists(project_name: str):
         return False
     
     
+def iter_plane(path: str, per_page: int = 100):
+    """
+    Iterate over all items of a paginated Plane list endpoint under the workspace,
+    e.g. "projects/" or "projects/<project_id>/issues/", following Plane's cursors.
+
+    Raises requests.RequestException if a page cannot be fetched.
+    """
+    def fetch_page(cursor):
+        params = {'per_page': per_page}
+        if cursor:
+            params['cursor'] = cursor
+        response = plane_session.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        # some endpoints aren't paginated and return a plain list
+        if isinstance(data, list):
+            return data, None
+        next_cursor = data.get('next_cursor') if data.get('next_page_results') else None
+        return data.get('results', []), next_cursor
+
+    url = f"{PLANE_BASEURL}/api/v1/workspaces/{PLANE_WORKSPACE_SLUG}/{path}"
+    return _iter_pages(fetch_page, '')
+
+@read_cached
 def get_all_plane_projects():
     """Get all projects in plane."""
-    url = f"{PLANE_BASEURL}/api/v1/workspaces/{PLANE_WORKSPACE_SLUG}/projects/"
     try:
-        response = requests.get(url, headers=PLANE_HEADERS)
-        response.raise_for_status()
-        return response.json().get('results', [])
+        return list(iter_plane("projects/"))
     except Exception as e:
         logging.warning(f"Get all projects failed: {e}")
         return []
     
 
+@read_cached
 def get_plane_project_id(project_name):
     """Get the project_id for a specific project by its name."""
-    url = f"{PLANE_BASEURL}/api/v1/workspaces/{PLANE_WORKSPACE_SLUG}/projects/"
     try:
-        response = requests.get(url, headers=PLANE_HEADERS)
-        response.raise_for_status()
-        projects = response.json().get('results', [])
-        for project in projects:
+        for project in iter_plane("projects/"):
             if project.get('name') == project_name:
                 return project.get('id')
         logging.info(f"Project with name '{project_name}' not found.")
@@ -624,18 +1698,16 @@ def get_plane_project_id(project_name):
         logging.warning(f"Get project id failed: {e}")
         return None
 
+@read_cached
 def get_plane_project_all_issues(project_id):
     """Get the issues for a specific project"""
-    url = f"{PLANE_BASEURL}/api/v1/workspaces/{PLANE_WORKSPACE_SLUG}/projects/{project_id}/issues"
     try:
-        response = requests.get(url, headers=PLANE_HEADERS)
-        response.raise_for_status()
-        issues = response.json().get('results', [])
-        return issues
+        return list(iter_plane(f"projects/{project_id}/issues/"))
     except Exception as e:
         logging.warning(f"Get issues failed: {e}")
         return []
 
+@read_cached
 def get_plane_state_id_dict(project_id):
     """Get the relationship between state and id.
 
@@ -665,14 +1737,10 @@ def get_plane_state_id_dict(project_id):
             'c5ba193b-fab9-475f-bc4d-3161b2a52c70': 'Cancelled'
         }
     """
-    url = f"{PLANE_BASEURL}/api/v1/workspaces/{PLANE_WORKSPACE_SLUG}/projects/{project_id}/states/"
     id_map = {}
     state_map = {}
     try:
-        response = requests.get(url, headers=PLANE_HEADERS)
-        response.raise_for_status()
-        projects = response.json().get('results', [])
-        for project in projects:
+        for project in iter_plane(f"projects/{project_id}/states/"):
             state_map[project['name']]=project['id']
             id_map[project['id']]=project['name']
     except Exception as e:
@@ -680,14 +1748,11 @@ def get_plane_state_id_dict(project_id):
         return {}, {}
     return state_map, id_map
 
+@read_cached
 def get_plane_issue_details(project_id, issue_name):
     """Get details of a specific issue in a project."""
-    url = f"{PLANE_BASEURL}/api/v1/workspaces/{PLANE_WORKSPACE_SLUG}/projects/{project_id}/issues/"
     try:
-        response = requests.get(url, headers=PLANE_HEADERS)
-        response.raise_for_status()
-        issues = response.json().get('results', [])
-        for issue in issues:
+        for issue in iter_plane(f"projects/{project_id}/issues/"):
             if issue.get('name') == issue_name:
                 return issue
         logging.info(f"Issue with name '{issue_name}' not found.")
@@ -695,14 +1760,11 @@ def get_plane_issue_details(project_id, issue_name):
         logging.warning(f"Get issue detail failed: {e}")
         return None
     
+@read_cached
 def get_plane_cycle_details(project_id, cycle_name):
     """Get details of a specific cycle in a project."""
-    url = f"{PLANE_BASEURL}/api/v1/workspaces/{PLANE_WORKSPACE_SLUG}/projects/{project_id}/cycles/"
     try:
-        response = requests.get(url, headers=PLANE_HEADERS)
-        response.raise_for_status()
-        cycles = response.json().get('results', [])
-        for cycle in cycles:
+        for cycle in iter_plane(f"projects/{project_id}/cycles/"):
             if cycle.get('name') == cycle_name:
                 return cycle
         logging.info(f"Cycle with name '{cycle_name}' not found.")
@@ -710,6 +1772,7 @@ def get_plane_cycle_details(project_id, cycle_name):
         logging.warning(f"Get cycle detail failed: {e}")
         return None
 
+@read_cached
 def get_plane_issues_by_project_cycle(project_id: str, cycle_id:str):
     """
     Get issues for a specific cycle.
@@ -721,15 +1784,13 @@ def get_plane_issues_by_project_cycle(project_id: str, cycle_id:str):
     Returns:
         List: A list of issues in the cycle
     """
-    url = f"{PLANE_BASEURL}/api/v1/workspaces/{PLANE_WORKSPACE_SLUG}/projects/{project_id}/cycles/{cycle_id}/cycle-issues/"
     try:
-        response = requests.get(url, headers=PLANE_HEADERS)
-        response.raise_for_status()
-        return response.json().get('results', [])
+        return list(iter_plane(f"projects/{project_id}/cycles/{cycle_id}/cycle-issues/"))
     except requests.RequestException as e:
         logging.error(f"Error: {e}")
     return []
 
+@read_cached
 def get_plane_state_details(project_id, state_id):
     """
     Get details for a state.
@@ -762,29 +1823,31 @@ def get_plane_state_details(project_id, state_id):
     """
     url = f"{PLANE_BASEURL}/api/v1/workspaces/{PLANE_WORKSPACE_SLUG}/projects/{project_id}/states/{state_id}"
     try:
-        response = requests.get(url, headers=PLANE_HEADERS)
+        response = plane_session.get(url)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
         logging.error(f"Error: {e}")
     return dict()
 
+@invalidates_read_cache
 def create_plane_issue(project_id, issue_name):
     """ Create an issue in a project."""
     url = f"{PLANE_BASEURL}/api/v1/workspaces/{PLANE_WORKSPACE_SLUG}/projects/{project_id}/issues/"
     try:
-        response = requests.post(url, headers=PLANE_HEADERS, json={"name": issue_name})
+        response = plane_session.post(url, json={"name": issue_name})
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
         logging.warning(f"Create issue failed: {e}")
         return None
     
+@invalidates_read_cache
 def add_plane_issue_to_cycle(project_id, cycle_id, issue_id):
     """ Add an issue to a cycle."""
     url = f"{PLANE_BASEURL}/api/v1/workspaces/{PLANE_WORKSPACE_SLUG}/projects/{project_id}/cycles/{cycle_id}/cycle-issues/"
     try:
-        response = requests.post(url, headers=PLANE_HEADERS, json={"issues": [issue_id]})
+        response = plane_session.post(url, json={"issues": [issue_id]})
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
@@ -4,10 +4,45 @@ TEST_MODE = os.environ.get('TAC_TEST_MODE', False)
 
 SERVER_HOSTNAME = os.getenv('SERVER_HOSTNAME') or 'the-agent-company.com'
 
+# HTTP Config, applies to the pooled sessions used by all service helpers
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT') or 60)
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES') or 3)
+HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR') or 0.5)
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE') or 10)
+
+# Record wall time, HTTP and LLM usage per grader, and add them to the evaluation result
+METRICS_ENABLED = bool(os.getenv('TAC_EVAL_METRICS'))
+
+# Read cache Config, opt-in memoization of read-only service lookups in common.py
+READ_CACHE_ENABLED = bool(os.getenv('TAC_READ_CACHE'))
+READ_CACHE_TTL = float(os.getenv('TAC_READ_CACHE_TTL') or 300)
+
 # LLM Config
 LITELLM_API_KEY = os.environ.get("LITELLM_API_KEY")
 LITELLM_BASE_URL = os.environ.get("LITELLM_BASE_URL", "https://api.openai.com/v1")
 LITELLM_MODEL = os.environ.get("LITELLM_MODEL", "gpt-4o")
+# Use the local, deterministic LLM server (llm_server.py) instead of a real LLM. Unlike
+# TEST_MODE, requests still go through litellm, so this can be used for offline benchmarking.
+# Empty, 0, false and no turn it off, like in init.sh
+LOCAL_LLM = os.environ.get('TAC_LOCAL_LLM', '').lower() not in ('', '0', 'false', 'no')
+if LOCAL_LLM:
+    LOCAL_LLM_PORT = os.getenv('LOCAL_LLM_PORT') or '8099'
+    LITELLM_BASE_URL = f"http://localhost:{LOCAL_LLM_PORT}/v1"
+    LITELLM_API_KEY = LITELLM_API_KEY or "local"
+# Concurrency limit and rate-limit backoff of evaluate_many_with_llm
+LLM_CONCURRENCY = int(os.environ.get("LLM_CONCURRENCY") or 8)
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES") or 5)
+LLM_BACKOFF_FACTOR = float(os.environ.get("LLM_BACKOFF_FACTOR") or 1)
+# Images sent to the LLM are downscaled so that their longest edge is at most this many pixels,
+# and re-encoded as JPEG. Set to 0 to send images as they are
+LLM_IMAGE_MAX_EDGE = int(os.environ.get("LLM_IMAGE_MAX_EDGE") or 1568)
+LLM_IMAGE_QUALITY = int(os.environ.get("LLM_IMAGE_QUALITY") or 85)
+# Chat histories longer than this many tokens are truncated to the most recent and relevant
+# messages before LLM evaluation, or summarized chunk by chunk if CHAT_HISTORY_SUMMARIZE is set
+CHAT_HISTORY_TOKEN_BUDGET = int(os.environ.get("CHAT_HISTORY_TOKEN_BUDGET") or 4000)
+CHAT_HISTORY_SUMMARIZE = bool(os.environ.get("CHAT_HISTORY_SUMMARIZE"))
+# If set, LLM responses are cached in a SQLite database at this path, keyed by model and messages
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH")
 
 # OwnCloud Config
 OWNCLOUD_PORT = os.getenv('OWNCLOUD_PORT') or '8092'
@@ -18,6 +53,13 @@ OWNCLOUD_PASSWORD = "theagentcompany"
 # Rocketchat Config
 ROCKETCHAT_PORT = os.getenv('ROCKETCHAT_PORT') or '3000'
 ROCKETCHAT_URL = f"http://{SERVER_HOSTNAME}:{ROCKETCHAT_PORT}"
+# Chat helpers read from a history store that syncs new messages of all rooms at most
+# once per this many seconds, fetching up to ROCKETCHAT_SYNC_WORKERS rooms at a time
+ROCKETCHAT_SYNC_INTERVAL = float(os.getenv('ROCKETCHAT_SYNC_INTERVAL') or 5)
+ROCKETCHAT_SYNC_WORKERS = int(os.getenv('ROCKETCHAT_SYNC_WORKERS') or 8)
+# Messages fetched per history request. RocketChat caps this at its API_Upper_Count_Limit
+# setting (100 by default), so it should not be set higher than that
+ROCKETCHAT_HISTORY_PAGE_SIZE = int(os.getenv('ROCKETCHAT_HISTORY_PAGE_SIZE') or 100)
 
 # Gitlab Config
 GITLAB_PORT = os.getenv('GITLAB_PORT') or '8929'
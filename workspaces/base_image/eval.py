@@ -1,19 +1,29 @@
 """
 Entrypoint to run evaluation. It calls grade_checkpoints function in
 evaluator.py, which is customized per task.
+
+With --serve, it keeps the evaluator loaded and grades trajectories sent over a
+Unix socket, e.g. by `eval.py --socket <path> --trajectory_path ...`, so that
+re-grading doesn't pay for decryption and imports every time.
 """
 import os
 import base64
 import argparse
+import contextlib
 import json
 import sys
 import logging
+import socket
+import socketserver
+import threading
 
 import cryptography
 from cryptography.fernet import Fernet
 
 from scoring import Result
 
+DEFAULT_SOCKET_PATH = '/tmp/tac_eval.sock'
+
 def pad_key(key):
     while len(key) < 32:
         key += b'\x00'
@@ -67,43 +77,140 @@ def load_trajectory(file_path):
         logging.warning(f"Error reading trajectory file: {e}")
         return ""
 
+def grade(trajectory_path, result_path):
+    """Grade a trajectory with the decrypted evaluator and save the result. Returns the result as a dict"""
+    # evaluators import common, so this doesn't load anything new
+    import common
+
+    trajectory = ""
+    # Check if trajectory path is provided
+    if trajectory_path is None:
+        logging.warning("No trajectory file provided, assuming empty trajectory")
+    else:
+        trajectory = load_trajectory(trajectory_path)
+
+    collect_metrics = common.metrics_enabled()
+    if collect_metrics:
+        common.grader_metrics.clear()
+    with common.collect_metrics() if collect_metrics else contextlib.nullcontext() as metrics:
+        result = grade_checkpoints(trajectory)
+
+    if not isinstance(result, Result):
+        raise TypeError(f"grade_checkpoints must return Result type, got {type(result)}")
+
+    if not result.checkpoints:
+        raise ValueError(f"Result must have at least one checkpoint, got {result}")
+
+    # Save result to JSON file
+    result_json = result.to_dict()
+    logging.info(f'result is: {result_json}')
+    if collect_metrics:
+        result_json['metrics'] = {'total': metrics, 'graders': list(common.grader_metrics)}
+        logging.info(f"Grading took {metrics['wall_time']}s, with {sum(metrics['http_calls'].values())} HTTP calls "
+                     f"and {metrics['llm_calls']} LLM calls")
+    with open(result_path, 'w') as f:
+        json.dump(result_json, f, indent=4)
+
+    common.log_read_cache_stats()
+    common.log_llm_cache_stats()
+    return result_json
+
+class GradingRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles one grading request per connection: a JSON line with trajectory_path and
+    result_path (or {"command": "shutdown"}), answered with a JSON line containing
+    either the result or the error.
+    """
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            if request.get('command') == 'shutdown':
+                response = {'success': True}
+                # shutdown() blocks until serve_forever returns, so call it from another thread
+                threading.Thread(target=self.server.shutdown).start()
+            else:
+                import common
+                # services may have changed since the previous request
+                common.clear_read_cache()
+                common.clear_rocketchat_history_stores()
+                common.reset_shared_clients()
+                result = grade(request.get('trajectory_path'), request.get('result_path', './result.json'))
+                response = {'success': True, 'result': result}
+        except Exception as e:
+            logging.error("Failed to grade the task", exc_info=True)
+            response = {'success': False, 'error': repr(e)}
+        self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+
+def serve(socket_path):
+    """
+    Keep the decrypted evaluator and everything it imports loaded, and grade trajectories
+    sent over a Unix socket, one at a time.
+    """
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    with socketserver.UnixStreamServer(socket_path, GradingRequestHandler) as server:
+        logging.info(f"Evaluator is ready, listening on {socket_path}")
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(socket_path)
+
+def request_grading(socket_path, trajectory_path, result_path):
+    """Send a grading request to an evaluator started with --serve, and return its response"""
+    # the daemon may run in a different working directory
+    request = {
+        'trajectory_path': os.path.abspath(trajectory_path) if trajectory_path else None,
+        'result_path': os.path.abspath(result_path),
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        with sock.makefile('r') as f:
+            return json.loads(f.readline())
+
 def main():
     # Set up logging
     logging.basicConfig(level=logging.INFO)
-    
-    # decrypt evaluator.py
-    decrypt_and_execute()
 
     # Set up argument parser
     parser = argparse.ArgumentParser(description='Grade checkpoints from trajectory and save results')
     parser.add_argument('--trajectory_path', required=False, default=None, help='Path to the trajectory file')
     parser.add_argument('--result_path', required=False, default='./result.json', help='Path to save the evaluation result JSON')
+    parser.add_argument('--no-llm-cache', action='store_true', help='Always query the LLM, even if LLM_CACHE_PATH is set')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Add wall time, HTTP and LLM usage of each grader to the result JSON')
+    parser.add_argument('--serve', action='store_true', help='Keep running and grade trajectories sent over --socket')
+    parser.add_argument('--socket', default=None,
+                        help=f'Unix socket of the grading daemon. Without --serve, send the grading request to it '
+                             f'instead of loading the evaluator. Defaults to {DEFAULT_SOCKET_PATH} with --serve')
 
     # Parse arguments
     args = parser.parse_args()
 
-    trajectory = ""
-    try:
-        # Check if trajectory path is provided
-        if args.trajectory_path is None:
-            logging.warning("No trajectory file provided, assuming empty trajectory")
-        else:
-            trajectory = load_trajectory(args.trajectory_path)
-        
-        result = grade_checkpoints(trajectory)
+    if args.socket and not args.serve:
+        response = request_grading(args.socket, args.trajectory_path, args.result_path)
+        if not response.get('success'):
+            logging.error(f"Failed to grade the task: {response.get('error')}")
+            sys.exit(1)
+        logging.info(f"result is: {response['result']}")
+        return
 
-        if not isinstance(result, Result):
-            raise TypeError(f"grade_checkpoints must return Result type, got {type(result)}")
-        
-        if not result.checkpoints:
-            raise ValueError(f"Result must have at least one checkpoint, got {result}")
-
-        # Save result to JSON file
-        result_json = result.to_dict()
-        logging.info(f'result is: {result_json}')
-        with open(args.result_path, 'w') as f:
-            json.dump(result_json, f, indent=4)
-            
+    # decrypt evaluator.py
+    decrypt_and_execute()
+
+    import common
+    if args.no_llm_cache:
+        common.enable_llm_cache(False)
+    if args.metrics:
+        common.enable_metrics()
+
+    if args.serve:
+        serve(args.socket or DEFAULT_SOCKET_PATH)
+        return
+
+    try:
+        grade(args.trajectory_path, args.result_path)
     except Exception:
         logging.error("Failed to grade the task", exc_info=True)
         sys.exit(1)
@@ -21,6 +21,17 @@ fi
 ######################################
 
 ########## RUN INITIALIZATION ########
+# use a local, deterministic LLM for NPCs and evaluators, if requested
+# (any value but empty, 0, false and no, the same values as in config.py)
+case "$(echo "$TAC_LOCAL_LLM" | tr '[:upper:]' '[:lower:]')" in
+    ""|0|false|no) ;;
+    *)
+        nohup python_default /utils/llm_server.py > /tmp/llm_server.log 2>&1 &
+        export LITELLM_BASE_URL="http://localhost:${LOCAL_LLM_PORT:-8099}/v1"
+        export LITELLM_API_KEY="${LITELLM_API_KEY:-local}"
+        ;;
+esac
+
 # set up task-specific NPC ENV, only if NPC is required
 if [ -f "/npc/scenarios.json" ]; then
     python_default /npc/run_multi_npc.py
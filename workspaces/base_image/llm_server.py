@@ -0,0 +1,160 @@
+"""
+A local, deterministic stand-in for an OpenAI-compatible LLM server.
+
+It answers /v1/chat/completions requests with scripted or rule-based responses,
+so that evaluators, NPCs and the LLM caching/batching layers can be exercised end
+to end without network access. It is enabled by setting TAC_LOCAL_LLM, which makes
+config.py point LITELLM_BASE_URL at this server; init.sh starts it in that case.
+
+Responses are picked as follows, using the text of the last user message:
+1. the first rule in LOCAL_LLM_RULES (a JSON file with a list of
+   {"pattern": "<regex>", "response": "<text>"} objects) whose pattern matches,
+2. a sotopia "speak" action, if the prompt asks for an action in JSON format,
+3. LOCAL_LLM_DEFAULT_ANSWER ("yes" by default), if the prompt asks for yes or no,
+4. a fixed acknowledgement otherwise.
+
+LOCAL_LLM_LATENCY adds a fixed delay (in seconds) to every response, to mimic a
+real LLM when benchmarking.
+"""
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LOCAL_LLM_PORT = int(os.getenv('LOCAL_LLM_PORT') or 8099)
+LOCAL_LLM_LATENCY = float(os.getenv('LOCAL_LLM_LATENCY') or 0)
+LOCAL_LLM_RULES = os.getenv('LOCAL_LLM_RULES')
+LOCAL_LLM_DEFAULT_ANSWER = os.getenv('LOCAL_LLM_DEFAULT_ANSWER') or 'yes'
+
+SPEAK_ARGUMENT = "Thanks for reaching out. I'm happy to help, could you share more details?"
+FALLBACK_RESPONSE = "OK"
+
+
+def load_rules(path):
+    if not path:
+        return []
+    with open(path, 'r') as f:
+        rules = json.load(f)
+    return [(re.compile(rule['pattern'], re.IGNORECASE | re.DOTALL), rule['response']) for rule in rules]
+
+
+def message_text(message):
+    """Text of a chat message, whose content is either a string or a list of parts"""
+    content = message.get('content') or ''
+    if isinstance(content, str):
+        return content
+    return '\n'.join(part.get('text', '') for part in content if part.get('type') == 'text')
+
+
+def respond(messages, rules):
+    user_messages = [m for m in messages if m.get('role') == 'user'] or messages
+    prompt = message_text(user_messages[-1]) if user_messages else ''
+
+    for pattern, response in rules:
+        if pattern.search(prompt):
+            return response
+    if 'action_type' in prompt:
+        return json.dumps({"action_type": "speak", "argument": SPEAK_ARGUMENT})
+    if re.search(r'\byes\b.*\bno\b', prompt, re.IGNORECASE | re.DOTALL):
+        return LOCAL_LLM_DEFAULT_ANSWER
+    return FALLBACK_RESPONSE
+
+
+def count_tokens(text):
+    # a rough estimate is good enough for usage reporting
+    return max(1, len(text) // 4)
+
+
+class LLMRequestHandler(BaseHTTPRequestHandler):
+    rules = []
+
+    def _send_json(self, code, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') in ('/v1/models', '/models'):
+            self._send_json(200, {"object": "list", "data": [{"id": "local-llm", "object": "model", "owned_by": "local"}]})
+        elif self.path.rstrip('/') == '/health':
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        if self.path.rstrip('/') not in ('/v1/chat/completions', '/chat/completions'):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            messages = request['messages']
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {"error": {"message": f"Invalid request: {e}"}})
+            return
+
+        if LOCAL_LLM_LATENCY:
+            time.sleep(LOCAL_LLM_LATENCY)
+
+        content = respond(messages, self.rules)
+        model = request.get('model', 'local-llm')
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        prompt_tokens = sum(count_tokens(message_text(m)) for m in messages)
+        completion_tokens = count_tokens(content)
+
+        if request.get('stream'):
+            self._stream(completion_id, model, content)
+            return
+
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _stream(self, completion_id, model, content):
+        """Send the whole response as a single chunk, followed by the end of stream marker"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        for delta, finish_reason in [({"role": "assistant", "content": content}, None), ({}, "stop")]:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    LLMRequestHandler.rules = load_rules(LOCAL_LLM_RULES)
+    server = ThreadingHTTPServer(('0.0.0.0', LOCAL_LLM_PORT), LLMRequestHandler)
+    logging.info(f"Local LLM server listening on port {LOCAL_LLM_PORT} with {len(LLMRequestHandler.rules)} rules")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
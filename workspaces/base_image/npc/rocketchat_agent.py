@@ -6,6 +6,7 @@ import json
 import aiohttp
 import pydantic
 import requests
+from requests.adapters import HTTPAdapter
 
 from sotopia.agents import BaseAgent
 from sotopia.database import AgentProfile, MessageTransaction
@@ -22,6 +23,31 @@ from rocketchat_bot import RocketChatBot
 server_url = os.getenv('BOT_URL') or 'http://localhost:3000'
 credential_file_path = os.getenv('CREDENTIAL_FILE_PATH') or 'npc_credential.json'
 
+# The RocketChat clients of all NPCs in this process share one connection pool. Each client
+# sends its own auth headers, so the session itself holds no login state
+session = requests.Session()
+session.mount('http://', HTTPAdapter(pool_maxsize=32))
+session.mount('https://', HTTPAdapter(pool_maxsize=32))
+
+# called with the credential name of every NPC once it has logged in
+login_callbacks = []
+
+# If set, every NPC creates <credential name>.ready in this directory once it has logged
+# in, which run_multi_npc.py waits for
+ready_dir = os.getenv('NPC_READY_DIR')
+
+
+def signal_ready(credential_name):
+    path = os.path.join(ready_dir, f"{credential_name}.ready")
+    # write to a temporary file first, so that the launcher never sees a partial file
+    with open(path + '.tmp', 'w') as f:
+        f.write(datetime.now().isoformat())
+    os.replace(path + '.tmp', path)
+
+
+if ready_dir:
+    login_callbacks.append(signal_ready)
+
 def get_credentials(user_key):
     # Attempt to get the user's credentials based on the provided key
     with open(credential_file_path, 'r') as file:
@@ -86,7 +112,8 @@ class RocketChatAgent(BaseAgent[Observation, AgentAction]):
         print(f"step 1: connect to the server: user first name: {credential_name}")
         username, password = get_credentials(credential_name)
         print(username, password)
-        self.bot = RocketChatBot(username, password, server_url)
+        self.credential_name = credential_name
+        self.bot = RocketChatBot(username, password, server_url, session=session)
         self.send_init_message()
         logging.info(f"Session ID: {self.session_id}")
 
@@ -116,6 +143,8 @@ class RocketChatAgent(BaseAgent[Observation, AgentAction]):
         
         print(f"Login successful! User info: {login_info}")
         print("RocketChat Agent Listening")
+        for callback in login_callbacks:
+            callback(self.credential_name)
         return
 
     async def send_message(self,obs: Observation):
@@ -138,7 +167,9 @@ class RocketChatAgent(BaseAgent[Observation, AgentAction]):
         # if not success:
         #     self.reset("Someone has left or the conversation is too long.")
         #     return AgentAction(action_type="leave", argument="")
-        return self.constrct_speak_action(self.bot.run())
+        # the bot blocks until a message arrives, so wait in a thread to let other NPCs in
+        # the same event loop run meanwhile
+        return self.constrct_speak_action(await asyncio.to_thread(self.bot.run))
 
     def constrct_speak_action(self,message):
         action_string = message
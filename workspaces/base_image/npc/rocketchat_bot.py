@@ -4,18 +4,26 @@ from time import sleep
 import os
 
 from rocketchat_API.rocketchat import RocketChat
+from rocketchat_realtime import RocketChatRealtime
 
 agent_username = os.getenv('AGENT_USERNAME') or 'theagentcompany'
+# "realtime" waits for new messages over the websocket API, "poll" checks all IMs every second
+transport = os.getenv('NPC_TRANSPORT') or 'realtime'
+# with the realtime transport, all IMs are still checked if no message arrived for this many seconds
+realtime_fallback_interval = float(os.getenv('NPC_REALTIME_FALLBACK_INTERVAL') or 30)
 
 class RocketChatBot(object):
-    def __init__(self, botname, passwd, server, command_character=None):
+    def __init__(self, botname, passwd, server, command_character=None, session=None):
         self.botname = botname
-        self.api = RocketChat(user=botname, password=passwd, server_url=server)
+        self.api = RocketChat(user=botname, password=passwd, server_url=server, session=session)
         self.lastts = {}
         self.command_character = command_character
         self.last_channel_id = "GENERAL"
         self.username = self.api.me().json()['username']
         self.default_latestts = "2024-10-01T00:00:00.000Z"
+        self.realtime = None
+        if transport == 'realtime':
+            self.realtime = RocketChatRealtime(server, self.api.headers['X-Auth-Token'], self.username).start()
 
     def get_status(self, auser):
         return self.api.users_get_presence(username=auser)
@@ -100,10 +108,21 @@ class RocketChatBot(object):
             self.load_im_ts(im.get('_id'))
 
         message = ""
+        # None means all IMs are checked
+        rooms = None
         while 1:
             for im in self.api.im_list().json().get('ims', []):
+                if rooms is not None and im.get('_id') not in rooms:
+                    continue
                 message = self.process_im(im.get('_id'))
                 if message is not None:
                     return message
+            rooms = self.wait_for_messages()
+
+    def wait_for_messages(self):
+        """Wait for new messages, returning the ids of the rooms to check, or None to check all IMs"""
+        if self.realtime is None or not self.realtime.connected:
             print(self.botname, ": No message received, waiting...")
             sleep(1)
+            return None
+        return self.realtime.wait_for_rooms(realtime_fallback_interval)
@@ -0,0 +1,118 @@
+"""
+Realtime notifications of new RocketChat messages, over the DDP websocket API.
+
+RocketChatRealtime subscribes to the stream-room-messages stream of the logged in
+user ("__my_messages__"), which covers all rooms the user is in, and records the
+rooms that received a message from someone else. The bot waits on it instead of
+polling the REST API, and still reads the messages themselves over REST.
+"""
+import asyncio
+import json
+import logging
+import re
+import threading
+
+import aiohttp
+
+# seconds to wait before reconnecting, doubled after every failed attempt
+RECONNECT_DELAY = 1
+MAX_RECONNECT_DELAY = 30
+
+
+class RocketChatRealtime(object):
+    def __init__(self, server_url, auth_token, username):
+        self.url = re.sub(r'^http', 'ws', server_url.rstrip('/')) + '/websocket'
+        self.auth_token = auth_token
+        self.username = username
+        self.connected = False
+        self._rooms = set()
+        # set when messages may have been missed, e.g. while reconnecting
+        self._missed = False
+        self._condition = threading.Condition()
+        self._closed = False
+        self._loop = None
+        self._ws = None
+        self._thread = threading.Thread(target=self._run, name=f"rocketchat-realtime-{username}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._closed = True
+        if self._loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+
+    def wait_for_rooms(self, timeout):
+        """
+        Wait until a message arrives or timeout seconds have passed. Returns the ids of
+        the rooms with new messages since the previous call, or None if all rooms should
+        be checked, because the wait timed out or messages may have been missed.
+        """
+        with self._condition:
+            if not self._rooms and not self._missed:
+                self._condition.wait(timeout)
+            rooms, missed = self._rooms, self._missed
+            self._rooms, self._missed = set(), False
+        return None if missed or not rooms else rooms
+
+    def _notify(self, room_id=None):
+        with self._condition:
+            if room_id is None:
+                self._missed = True
+            else:
+                self._rooms.add(room_id)
+            self._condition.notify_all()
+
+    def _run(self):
+        asyncio.run(self._listen_forever())
+
+    async def _listen_forever(self):
+        self._loop = asyncio.get_running_loop()
+        delay = RECONNECT_DELAY
+        while not self._closed:
+            try:
+                await self._listen()
+                delay = RECONNECT_DELAY
+            except Exception as e:
+                logging.warning(f"RocketChat realtime connection of {self.username} failed: {e}")
+            if self.connected:
+                self.connected = False
+                self._notify()
+            if not self._closed:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _listen(self):
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(self.url) as ws:
+                self._ws = ws
+                await ws.send_json({"msg": "connect", "version": "1", "support": ["1"]})
+                async for frame in ws:
+                    if frame.type != aiohttp.WSMsgType.TEXT:
+                        break
+                    await self._handle(ws, json.loads(frame.data))
+
+    async def _handle(self, ws, data):
+        kind = data.get('msg')
+        if kind == 'ping':
+            await ws.send_json({"msg": "pong"})
+        elif kind == 'connected':
+            await ws.send_json({"msg": "method", "method": "login", "id": "login",
+                                "params": [{"resume": self.auth_token}]})
+        elif kind == 'result' and data.get('id') == 'login':
+            if data.get('error'):
+                raise RuntimeError(f"Login failed: {data['error']}")
+            await ws.send_json({"msg": "sub", "id": "messages", "name": "stream-room-messages",
+                                "params": ["__my_messages__", False]})
+        elif kind == 'ready' and 'messages' in data.get('subs', []):
+            logging.info(f"Subscribed to new messages of {self.username}")
+            self.connected = True
+            # messages posted before subscribing are only visible over REST
+            self._notify()
+        elif kind == 'nosub' and data.get('id') == 'messages':
+            raise RuntimeError(f"Subscription failed: {data.get('error')}")
+        elif kind == 'changed' and data.get('collection') == 'stream-room-messages':
+            for message in data.get('fields', {}).get('args', []):
+                if message.get('u', {}).get('username') != self.username:
+                    self._notify(message.get('rid') or data['fields'].get('eventName'))
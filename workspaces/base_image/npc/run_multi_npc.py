@@ -17,17 +17,57 @@ with open(scenarios_file_path, 'r') as file:
 # Extract keys (names) into a list
 names = list(data.keys())
 
-# Loop through the names and execute the command
-for name in names:
-    print(f"Launching {name}")
-    command = f"LITELLM_API_KEY={LITELLM_API_KEY} LITELLM_BASE_URL={LITELLM_BASE_URL} LITELLM_MODEL={LITELLM_MODEL} python_default /npc/run_one_npc.py --agent_name=\"{name}\""
+# Run all NPCs in a single process, instead of one process per NPC
+single_process = bool(os.getenv('NPC_SINGLE_PROCESS'))
+# Every NPC creates <name>.ready in this directory once it has logged in
+ready_dir = os.getenv('NPC_READY_DIR') or '/tmp/npc_ready'
+# Seconds to wait for all NPCs to log in, after which the task starts anyway
+ready_timeout = float(os.getenv('NPC_READY_TIMEOUT') or 120)
+env_vars = f"LITELLM_API_KEY={LITELLM_API_KEY} LITELLM_BASE_URL={LITELLM_BASE_URL} LITELLM_MODEL={LITELLM_MODEL} NPC_READY_DIR={ready_dir}"
+
+
+def wait_until_ready(names, start_time):
+    """Wait until every NPC has signalled readiness or the timeout expires, and report how long each took"""
+    pending = set(names)
+    while pending and time.time() - start_time < ready_timeout:
+        for name in list(pending):
+            path = os.path.join(ready_dir, f"{name}.ready")
+            if os.path.exists(path):
+                pending.remove(name)
+                print(f"{name} is ready after {os.path.getmtime(path) - start_time:.1f}s")
+        if pending:
+            time.sleep(0.2)
+    if pending:
+        print(f"Warning: {', '.join(sorted(pending))} not ready after {ready_timeout:.0f}s, starting anyway")
+    else:
+        print(f"All {len(names)} NPCs are ready after {time.time() - start_time:.1f}s")
+
+
+# clear readiness signals of previous launches
+os.makedirs(ready_dir, exist_ok=True)
+for file_name in os.listdir(ready_dir):
+    os.remove(os.path.join(ready_dir, file_name))
+
+start_time = time.time()
+if single_process:
+    print(f"Launching {', '.join(names)} in one process")
+    command = f"{env_vars} python_default /npc/run_npc_host.py"
     print(command)
     # do not let it print logs to stdout
     subprocess.Popen(command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+else:
+    # Loop through the names and execute the command
+    for name in names:
+        print(f"Launching {name}")
+        command = f"{env_vars} python_default /npc/run_one_npc.py --agent_name=\"{name}\""
+        print(command)
+        # do not let it print logs to stdout
+        subprocess.Popen(command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-# sleep 30 seconds so that NPC processes are launched
-time.sleep(30)
+wait_until_ready(names, start_time)
 
 # Use following code to kill the backgroup npc
 # pkill -f 'python run_one_npc.py'
-# ps aux | grep 'python run_one_npc.py'
\ No newline at end of file
+# ps aux | grep 'python run_one_npc.py'
+# or, with NPC_SINGLE_PROCESS set
+# pkill -f 'python run_npc_host.py'
\ No newline at end of file
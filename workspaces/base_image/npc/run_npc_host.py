@@ -0,0 +1,74 @@
+"""
+Run all NPCs of a task in one process and one event loop, instead of one
+run_one_npc.py process per NPC. sotopia, litellm and redis_om are imported once,
+and all NPCs share the Redis connection pool and the RocketChat HTTP connection pool.
+Like run_one_npc.py, every NPC signals readiness through NPC_READY_DIR once it has
+logged in.
+"""
+import asyncio
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import rocketchat_agent
+from server import run_server
+from run_one_npc import BASE_URL, MODEL_NAME
+
+scenarios_file_path = os.getenv('SCENARIOS_FILE_PATH') or 'scenarios.json'
+
+
+async def run_npcs(names):
+    # every NPC waits for messages in a thread of the default executor, so it must not
+    # make NPCs queue for one another
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=len(names) + 4))
+
+    logged_in = set()
+    def on_login(name):
+        logged_in.add(name)
+        if logged_in.issuperset(names):
+            logging.info(f"All {len(names)} NPCs are logged in")
+    rocketchat_agent.login_callbacks.append(on_login)
+
+    results = await asyncio.gather(*[
+        run_server(
+            # The agent1 is the examinee
+            # The agent2 is the sotopia NPC
+            # This should match the profile and goals order
+            model_dict={
+                "env": "gpt-4",
+                "agent1": "rocketchat",
+                "agent2": f"custom/{MODEL_NAME}@{BASE_URL}",
+            },
+            # Agent Roles are uesless here.
+            agents_roles={
+                "agent1": "",
+                "agent2": "",
+            },
+            agent_name=name,
+        )
+        for name in names
+    ], return_exceptions=True)
+
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            logging.error(f"NPC {name} failed: {result!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--agent_names', type=str, nargs='*', default=None,
+                        help="NPC names to run, defaults to all NPCs in the scenarios file")
+    args = parser.parse_args()
+
+    names = args.agent_names
+    if not names:
+        with open(scenarios_file_path, 'r') as file:
+            names = list(json.load(file).keys())
+    logging.info(f"Launching {len(names)} NPCs: {names}")
+
+    asyncio.run(run_npcs(names))
+
+if __name__ == "__main__":
+    main()
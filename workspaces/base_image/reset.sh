@@ -13,8 +13,37 @@ check_service_health() {
     [ "$http_status" = "200" ]
 }
 
-# Function to wait for services to be ready
+# Function to wait for services to be ready, using the long-poll endpoint of
+# the api-server, which returns as soon as all services are healthy.
+# Falls back to polling health checks if the api-server doesn't support it.
 wait_for_services() {
+    local timeout=900  # 15 minutes maximum wait time
+    local services
+    local http_status
+    services=$(IFS=,; echo "${reset_services[*]}")
+
+    echo "Waiting for services to be ready: $services"
+    http_status=$(curl -s -o /dev/null -w "%{http_code}" --max-time $((timeout + 60)) \
+        "http://the-agent-company.com:2999/api/wait-ready?services=${services}&timeout=${timeout}") || true
+
+    case "$http_status" in
+        200)
+            echo "All services are ready!"
+            return 0
+            ;;
+        404|405)
+            echo "api-server doesn't support waiting for readiness, falling back to polling"
+            poll_services
+            ;;
+        *)
+            echo "Error: Timeout waiting for services to be ready (status $http_status)"
+            return 1
+            ;;
+    esac
+}
+
+# Function to poll health checks until services are ready
+poll_services() {
     local max_attempts=180  # 15 minutes maximum wait time (180 * 5 seconds)
     local attempt=1
     local all_services_ready
@@ -46,11 +75,23 @@ wait_for_services() {
     return 1
 }
 
+# RESET_MODE=snapshot (default) asks the api-server to restore services from
+# snapshots when available; the api-server falls back to re-creating containers
+# otherwise. Set RESET_MODE=recreate to always re-create containers.
+
 # Check and reset each service
+# SKIP_RESET_SERVICES is an optional comma-separated list of services that the
+# evaluation driver knows are already in a clean state (e.g. the previous task
+# only read from them). Those services are not reset, but we still wait for them
+# to be healthy.
 for service in rocketchat plane gitlab owncloud; do
     if grep -q "$service" /utils/dependencies.yml; then
-        echo "Resetting $service..."
-        curl -X POST "http://the-agent-company.com:2999/api/reset-${service}"
+        if echo ",${SKIP_RESET_SERVICES}," | grep -q ",${service},"; then
+            echo "Skipping reset of $service, it is already in a clean state"
+        else
+            echo "Resetting $service..."
+            curl -X POST "http://the-agent-company.com:2999/api/reset-${service}?mode=${RESET_MODE:-snapshot}"
+        fi
         reset_services+=("$service")
     fi
 done
@@ -1,10 +1,16 @@
+import contextvars
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import List, Callable, Optional
+from typing import List, Callable, Optional, Sequence, Tuple, Union
 
 @dataclass
 class Checkpoint:
     total: int
     result: int
+    # seconds spent grading this checkpoint, if measured
+    wall_time: Optional[float] = None
     
     def __post_init__(self):
         if not isinstance(self.total, int):
@@ -56,12 +62,89 @@ class Result:
         return {
             "checkpoints": [
                 {"total": cp.total, "result": cp.result}
+                if cp.wall_time is None else
+                {"total": cp.total, "result": cp.result, "wall_time": cp.wall_time}
                 for cp in self.checkpoints
             ],
             "final_score": self.final_score
         }
 
 
+@dataclass
+class CheckpointSpec:
+    """
+    A checkpoint to be graded by run_checkpoints.
+
+    grade is called with args and returns either a bool, in which case the checkpoint
+    gets all or nothing of total, or the score as an int. depends_on lists the
+    (1-based) numbers of checkpoints that must get full score before this one is
+    graded; otherwise this checkpoint gets 0 without being graded.
+    """
+    grade: Callable[..., Union[bool, int]]
+    total: int = 1
+    args: tuple = ()
+    depends_on: Tuple[int, ...] = ()
+
+
+def run_checkpoints(checkpoints: Sequence[Union[CheckpointSpec, Callable]],
+                    scoring_strategy: Optional[Callable[[List[Checkpoint]], dict]] = None,
+                    parallel: bool = True, max_workers: Optional[int] = None) -> Result:
+    """
+    Grade checkpoints and assemble the Result in the given order, recording the wall
+    time of each checkpoint. Plain functions are treated as CheckpointSpec(func).
+
+    With parallel=True, independent checkpoints are graded concurrently in a thread
+    pool, and a checkpoint starts as soon as the checkpoints it depends on are graded.
+    Graders should be independent of each other apart from declared dependencies.
+
+    Example:
+        >>> result = run_checkpoints([
+        ...     CheckpointSpec(grade_checkpoint1, total=1, args=(trajectory,)),
+        ...     CheckpointSpec(grade_checkpoint2, total=2),
+        ...     CheckpointSpec(grade_checkpoint3, total=1, depends_on=(2,)),
+        ... ], bonus_for_completing_any)
+    """
+    specs = [cp if isinstance(cp, CheckpointSpec) else CheckpointSpec(cp) for cp in checkpoints]
+    for number, spec in enumerate(specs, start=1):
+        if any(not 1 <= dep < number for dep in spec.depends_on):
+            raise ValueError(f"checkpoint {number} can only depend on earlier checkpoints, got {spec.depends_on}")
+
+    graded: List[Optional[Checkpoint]] = [None] * len(specs)
+
+    def grade(index: int) -> Checkpoint:
+        spec = specs[index]
+        if any(graded[dep - 1].result < graded[dep - 1].total for dep in spec.depends_on):
+            logging.info(f"Skipping checkpoint {index + 1}, as a checkpoint it depends on is not complete")
+            return Checkpoint(spec.total, 0, wall_time=0.0)
+        start = time.perf_counter()
+        try:
+            score = spec.grade(*spec.args)
+        except Exception as e:
+            logging.error(f"Error in checkpoint {index + 1}: {str(e)}")
+            score = 0
+        score = spec.total * int(score) if isinstance(score, bool) else int(score or 0)
+        return Checkpoint(spec.total, score, wall_time=round(time.perf_counter() - start, 3))
+
+    if not parallel:
+        for index in range(len(specs)):
+            graded[index] = grade(index)
+        return Result(graded, scoring_strategy)
+
+    pending = list(range(len(specs)))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+        while pending or running:
+            for index in list(pending):
+                if all(graded[dep - 1] is not None for dep in specs[index].depends_on):
+                    # graders see the same context variables as the caller
+                    running[pool.submit(contextvars.copy_context().run, grade, index)] = index
+                    pending.remove(index)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                graded[running.pop(future)] = future.result()
+    return Result(graded, scoring_strategy)
+
+
 # Strategy: get full score if final checkpoint completes
 def bonus_for_completing_final(checkpoints: List[Checkpoint]) -> dict:
     """
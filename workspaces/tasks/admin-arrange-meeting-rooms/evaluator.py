@@ -3,12 +3,12 @@ import logging
 from typing import List
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, get_rocketchat_personal_chat_history, grader
+from common import lazy_rocketchat_client, get_rocketchat_personal_chat_history, grader
 
 
 REFERENCE_ANSWER = 4
 
-rocket_client = create_rocketchat_client()
+rocket_client = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint_1() -> bool:
@@ -4,9 +4,9 @@ import pandas as pd
 
 from typing import List
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, get_rocketchat_personal_chat_history, grader
+from common import lazy_rocketchat_client, get_rocketchat_personal_chat_history, grader
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 
 @grader
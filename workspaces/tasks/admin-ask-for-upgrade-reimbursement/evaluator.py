@@ -2,11 +2,11 @@
 from typing import List
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, grader
+from common import lazy_rocketchat_client, grader
 from common import get_rocketchat_personal_chat_history, evaluate_with_llm
 
 # Initialize RocketChat client
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint1():
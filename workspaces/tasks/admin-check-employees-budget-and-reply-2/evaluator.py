@@ -4,7 +4,7 @@ from scoring import Result, Checkpoint, bonus_for_completing_final
 
 from typing import List
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
  
 @grader
 def checkpoint1():
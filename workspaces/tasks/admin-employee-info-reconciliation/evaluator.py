@@ -5,9 +5,9 @@ from typing import List
 import pandas as pd
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, num_rocketchat_users_contacted, grader
+from common import lazy_rocketchat_client, num_rocketchat_users_contacted, grader
 
-rocket_client = create_rocketchat_client()
+rocket_client = lazy_rocketchat_client()
 
 
 def load_employees_csv():
@@ -7,7 +7,7 @@ from litellm import logging
 from scoring import Result, Checkpoint
 from common import *
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def checkpoint1():
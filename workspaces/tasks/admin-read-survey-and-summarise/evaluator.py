@@ -2,10 +2,10 @@
 from typing import List
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, grader, get_rocketchat_personal_chat_history
+from common import lazy_rocketchat_client, grader, get_rocketchat_personal_chat_history
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint1(content: str):
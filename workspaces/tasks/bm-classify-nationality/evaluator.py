@@ -1,6 +1,6 @@
 from typing import List
 import pandas as pd
-from common import get_rocketchat_personal_chat_history, create_rocketchat_client, grader, check_and_download_file
+from common import get_rocketchat_personal_chat_history, lazy_rocketchat_client, grader, check_and_download_file
 from scoring import Result, Checkpoint, bonus_for_completing_any
 import logging
 
@@ -36,7 +36,7 @@ EXPECTED_CLASSIFICATIONS = {
 }
 
 # Create RocketChat client
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 
 def load_customer_data(file_path: str):
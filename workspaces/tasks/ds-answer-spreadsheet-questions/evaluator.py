@@ -3,10 +3,10 @@ import requests
 from typing import List
 from common import get_rocketchat_personal_chat_history
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, grader, evaluate_with_llm
+from common import lazy_rocketchat_client, grader, evaluate_with_llm
 
 # Initialize RocketChat client
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint1(trajectory):
@@ -2,10 +2,10 @@ import os
 import re
 from typing import List
 from scoring import Result, Checkpoint, bonus_for_completing_final
-from common import create_rocketchat_client, get_rocketchat_personal_chat_history, grader
+from common import lazy_rocketchat_client, get_rocketchat_personal_chat_history, grader
 
 # Initialize RocketChat client
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 # Expected values for average row and column counts 
 EXPECTED_AVG_ROWS = round(26.266666, 2)
@@ -1,10 +1,10 @@
 import re
 from typing import List
 from scoring import Result, Checkpoint, bonus_for_completing_any
-from common import create_rocketchat_client, get_rocketchat_personal_chat_history, grader
+from common import lazy_rocketchat_client, get_rocketchat_personal_chat_history, grader
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 # Expected results for the problematic files
 EXPECTED_MEANINGLESS_NAMES = ["wrgbn i53b;6.xlsx"]
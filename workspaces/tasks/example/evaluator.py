@@ -16,9 +16,9 @@ import os
 from typing import List
 
 from scoring import Result, Checkpoint, bonus_for_completing_final
-from common import grader, get_rocketchat_personal_chat_history, create_rocketchat_client
+from common import grader, get_rocketchat_personal_chat_history, lazy_rocketchat_client
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 # devnote: @grader is required for each checkpoint function
 #         it would capture runtime errors, log them, and return False
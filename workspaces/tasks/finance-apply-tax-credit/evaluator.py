@@ -2,10 +2,10 @@ import logging
 from typing import List
 import fitz
 
-from common import create_rocketchat_client, evaluate_chat_history_with_llm, grader
+from common import lazy_rocketchat_client, evaluate_chat_history_with_llm, grader
 from scoring import Result, Checkpoint
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 target_values = {
     'topmostSubform[0].Page1[0].f1_20[0]': '80168.46',
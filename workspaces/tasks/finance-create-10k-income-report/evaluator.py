@@ -3,11 +3,11 @@ import pandas as pd
 import numpy as np
 from typing import List
 from scoring import Result, Checkpoint, bonus_for_completing_final
-from common import create_rocketchat_client, evaluate_chat_history_with_llm, grader
+from common import lazy_rocketchat_client, evaluate_chat_history_with_llm, grader
 
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 # Reference solution
 REFERENCE_CSV = "/utils/reference_net_income.csv"
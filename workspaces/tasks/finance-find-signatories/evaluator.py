@@ -3,11 +3,11 @@ import logging
 import pandas as pd
 from typing import List
 from scoring import Result, Checkpoint, bonus_for_completing_final
-from common import create_rocketchat_client, evaluate_chat_history_with_llm, get_rocketchat_personal_chat_history, grader
+from common import lazy_rocketchat_client, evaluate_chat_history_with_llm, get_rocketchat_personal_chat_history, grader
 
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 # Reference solution
 REFERENCE_DIRECTORY = "/workspace/signatories.csv"
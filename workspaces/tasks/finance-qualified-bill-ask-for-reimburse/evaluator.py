@@ -5,8 +5,8 @@ from common import get_rocketchat_personal_chat_history
 from scoring import Result, Checkpoint, bonus_for_completing_final
 
 # Initialize RocketChat client
-from common import create_rocketchat_client, grader
-rocket = create_rocketchat_client()
+from common import lazy_rocketchat_client, grader
+rocket = lazy_rocketchat_client()
 
 
 @grader
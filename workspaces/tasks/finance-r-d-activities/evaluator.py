@@ -5,13 +5,13 @@ from collections import defaultdict
 import numpy as np
 from io import BytesIO
 
-from common import create_rocketchat_client, evaluate_chat_history_with_llm, check_file_in_owncloud_directory, get_binary_file_content_owncloud, grader
+from common import lazy_rocketchat_client, evaluate_chat_history_with_llm, check_file_in_owncloud_directory, get_binary_file_content_owncloud, grader
 from scoring import Result, Checkpoint
 
 employees_involved = ["Sarah Johnson","Li Ming","Zhang Wei","Wang Fang",
     "Mike Chen","Emily Zhou","Liu Qiang","Sophia Rodriguez","Alex Turner","Emma Lewis"]
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint1():
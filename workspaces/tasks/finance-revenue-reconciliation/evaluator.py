@@ -3,9 +3,9 @@ import pandas as pd
 from typing import List
 from scoring import Result, Checkpoint, bonus_for_completing_final
 import logging
-from common import grader, evaluate_chat_history_with_llm, create_rocketchat_client
+from common import grader, evaluate_chat_history_with_llm, lazy_rocketchat_client
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 REFERENCE_CONTRACTS = ["CTR006", "CTR037", "CTR069", "CTR080", 
                        "CTR093", "CTR103", "CTR118", "CTR135", 
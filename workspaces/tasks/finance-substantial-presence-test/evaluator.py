@@ -4,7 +4,7 @@ from common import *
 from scoring import Result, Checkpoint
 from typing import List
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
  
 
 @grader
@@ -4,11 +4,11 @@ from typing import List
 import pandas as pd
 import string 
 from common import grader
-from common import create_rocketchat_client, evaluate_chat_history_with_llm
+from common import lazy_rocketchat_client, evaluate_chat_history_with_llm
 from scoring import Result, Checkpoint
 
 # Initialize RocketChat client
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 EXCEL_PATH = '/workspace/Organized_Outings_Receipts.xlsx'
 GRAPH_PATH = '/workspace/outings_graph.png'
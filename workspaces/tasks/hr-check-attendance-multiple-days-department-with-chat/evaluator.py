@@ -8,10 +8,10 @@ from datetime import datetime
 from scoring import Result, Checkpoint, bonus_for_completing_final
 import logging
 
-from common import create_rocketchat_client, get_rocketchat_personal_chat_history, grader
+from common import lazy_rocketchat_client, get_rocketchat_personal_chat_history, grader
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 def check_excel_file_exists(file_path):
     abs_path = os.path.abspath(file_path)
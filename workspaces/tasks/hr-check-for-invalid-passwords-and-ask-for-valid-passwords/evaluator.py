@@ -2,12 +2,12 @@ from typing import List
 import os
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, num_rocketchat_users_contacted, grader
+from common import lazy_rocketchat_client, num_rocketchat_users_contacted, grader
 
 CHECKPOINT_1_POINTS = 2
 CHECKPOINT_2_POINTS = 2
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 USERS_WITH_INVALID_PASSWORDS = ["mark_johnson", "mike_chen"]
 USERS_WITH_VALID_PASSWORDS = ["sarah_johnson", "li_ming", "zhang_wei"]
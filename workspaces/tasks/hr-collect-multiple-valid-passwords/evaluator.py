@@ -4,12 +4,12 @@ import os
 import time
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, num_rocketchat_users_contacted, grader
+from common import lazy_rocketchat_client, num_rocketchat_users_contacted, grader
 
 CHECKPOINT_1_POINTS = 2
 CHECKPOINT_2_POINTS = 2
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 TEAM = ["mark_johnson", "sarah_johnson", "li_ming", "zhang_wei", "mike_chen"]
 VALID_PASSWORDS = {
@@ -4,10 +4,10 @@ from odf.opendocument import load
 from odf.element import Node
 import logging
 
-from common import llm_complete, get_binary_file_content_owncloud, create_rocketchat_client, get_rocketchat_channel_history, grader
+from common import llm_complete, get_binary_file_content_owncloud, lazy_rocketchat_client, get_rocketchat_channel_history, grader
 from scoring import Result, Checkpoint, bonus_for_completing_any
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint1(trajectory):
@@ -2,10 +2,10 @@
 from typing import List
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, grader
+from common import lazy_rocketchat_client, grader
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 def check_user_added(channel_name, username):
     members = rocket.channels_members(channel=channel_name).json()
@@ -3,13 +3,13 @@ from typing import List
 import os
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, get_rocketchat_personal_chat_history, grader
+from common import lazy_rocketchat_client, get_rocketchat_personal_chat_history, grader
 
 CHECKPOINT_1_POINTS = 1
 CHECKPOINT_2_POINTS = 1
 CHECKPOINT_3_POINTS = 2
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 ROCKETCHAT_URL = "http://the-agent-company.com:3000/home"
 
@@ -4,12 +4,12 @@ from io import BytesIO
 
 from pptx import Presentation
 
-from common import create_rocketchat_client, check_file_in_owncloud_directory, get_binary_file_content_owncloud, evaluate_with_llm, evaluate_chat_history_with_llm, grader
+from common import lazy_rocketchat_client, check_file_in_owncloud_directory, get_binary_file_content_owncloud, evaluate_with_llm, evaluate_chat_history_with_llm, grader
 from scoring import Result, Checkpoint
 from config import OWNCLOUD_URL, ROCKETCHAT_URL, GITLAB_BASEURL, PLANE_BASEURL
 
 # Initialize RocketChat client
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 theme_keywords=["internal", "tooling", "training"]
 rocketchat_channels = ["#general", "#kudos", "#engineering", "#help-desk", "#hr-announcements", "#product", 
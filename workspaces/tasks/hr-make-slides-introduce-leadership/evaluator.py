@@ -4,13 +4,13 @@ from typing import List
 
 import pptx
 
-from common import create_rocketchat_client
+from common import lazy_rocketchat_client
 from common import get_rocketchat_personal_chat_history
 from common import get_all_texts_from_slide, grader
 from scoring import Result, Checkpoint
 
 # Initialize RocketChat client
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 LEADERSHIP_NAMES = ["Sarah Johnson", "Mark Johnson", "Jessica Lee", "David Wong", "Chen Xinyi"]
 LEADERSHIP_POSITIONS = ["CTO", "Sales Director", "Marketing Manager", "Finance Director", "Human Resources Manager"]
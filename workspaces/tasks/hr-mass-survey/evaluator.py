@@ -4,10 +4,10 @@ from io import BytesIO
 import pandas as pd
 from collections import defaultdict
 
-from common import create_rocketchat_client, check_file_in_owncloud_directory, get_binary_file_content_owncloud, evaluate_chat_history_with_llm, grader
+from common import lazy_rocketchat_client, check_file_in_owncloud_directory, get_binary_file_content_owncloud, evaluate_chat_history_with_llm, grader
 from scoring import Result, Checkpoint
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 employees_involved = [
     "Sarah Johnson","Li Ming","Zhang Wei","Wang Fang",
     "Mike Chen","Emily Zhou","Liu Qiang","Priya Sharma",
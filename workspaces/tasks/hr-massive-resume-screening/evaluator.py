@@ -2,13 +2,13 @@ from typing import List
 
 from scoring import Result, Checkpoint, bonus_for_completing_final
 
-from common import create_rocketchat_client
+from common import lazy_rocketchat_client
 from common import evaluate_chat_history_with_llm
 from common import get_rocketchat_personal_chat_history
 from common import grader
 
 # Initialize RocketChat client
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def run_checkpoint_1(trajectory: str):
@@ -3,11 +3,11 @@ import logging
 from typing import List
 
 from scoring import Result, Checkpoint
-from common import evaluate_with_llm, create_rocketchat_client, get_rocketchat_personal_chat_history, get_owncloud_url_in_file, download_owncloud_content, grader
+from common import evaluate_with_llm, lazy_rocketchat_client, get_rocketchat_personal_chat_history, get_owncloud_url_in_file, download_owncloud_content, grader
 
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 ############################# Helper Functions #####################################
 
@@ -2,14 +2,14 @@ import logging
 import json
 from typing import List
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, evaluate_chat_history_with_llm, grader
+from common import lazy_rocketchat_client, evaluate_chat_history_with_llm, grader
 
 
 LEADER_NAME = "Chen Xinyi"
 TARGET_INTERVIEWER = "Emily Zhou"
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 
 @grader
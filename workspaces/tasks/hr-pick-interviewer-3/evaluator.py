@@ -1,11 +1,11 @@
 import logging
 from typing import List
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, evaluate_chat_history_with_llm, grader
+from common import lazy_rocketchat_client, evaluate_chat_history_with_llm, grader
 
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 
 @grader
@@ -4,12 +4,12 @@ from typing import List
 
 from scoring import Result, Checkpoint
 
-from common import create_rocketchat_client
+from common import lazy_rocketchat_client
 from common import evaluate_chat_history_with_llm
 from common import get_rocketchat_personal_chat_history, grader
 
 # Initialize RocketChat client
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint_1():
@@ -5,10 +5,10 @@ from typing import List
 from scoring import Result, Checkpoint
 
 from common import evaluate_with_llm
-from common import create_rocketchat_client, grader
+from common import lazy_rocketchat_client, grader
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 ############################# Helper Functions #####################################
 
 def get_channel_room_id(channel_name):
@@ -55,10 +55,8 @@ def compare_images_with_llm(image_path1: str = None, image_path2: str = None, qu
     query += f' Please answer "yes" if it does, or "no" if it does not. {additional_prompt}'
 
     try:
-        with open(image_path1, "rb") as f:
-            base64_image1 = base64.b64encode(f.read()).decode('utf-8')
-        with open(image_path2, "rb") as f:
-            base64_image2 = base64.b64encode(f.read()).decode('utf-8')
+        image_type1, base64_image1 = encode_image_for_llm(image_path1, IMAGE_JPEG)
+        image_type2, base64_image2 = encode_image_for_llm(image_path2, IMAGE_JPEG)
     except Exception as e:
         logging.error(f"Failed to read image: {e}")
         return False
@@ -72,13 +70,13 @@ def compare_images_with_llm(image_path1: str = None, image_path2: str = None, qu
     content.extend([{
         "type": "image_url",
         "image_url": {
-            "url": f"data:image/jpeg;base64,{base64_image1}"
+            "url": f"data:{image_type1};base64,{base64_image1}"
         }
     },
     {
         "type": "image_url",
         "image_url": {
-            "url": f"data:image/jpeg;base64,{base64_image2}"
+            "url": f"data:{image_type2};base64,{base64_image2}"
         }
     }])
 
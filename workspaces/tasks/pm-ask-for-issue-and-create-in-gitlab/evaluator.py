@@ -1,14 +1,14 @@
 from typing import List
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, num_rocketchat_users_contacted, make_gitlab_request, grader
+from common import lazy_rocketchat_client, num_rocketchat_users_contacted, make_gitlab_request, grader
 from config import GITLAB_USER
 
 CHECKPOINT_1_POINTS = 2
 CHECKPOINT_2_POINTS = 1
 CHECKPOINT_3_POINTS = 2
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 PROJECT_NAME = "risingwave"
 PROJECT_PATH = f"{GITLAB_USER}/{PROJECT_NAME}"
@@ -1,15 +1,15 @@
 from typing import List
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, get_rocketchat_personal_chat_history, get_plane_project_id, get_plane_issue_details, get_plane_state_details, grader
+from common import lazy_rocketchat_client, get_rocketchat_personal_chat_history, get_plane_project_id, lazy, get_plane_issue_details, get_plane_state_details, grader
 
 CHECKPOINT_1_POINTS = 2
 CHECKPOINT_2_POINTS = 1
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 PROJECT_NAME = 'RisingWave'
-PROJECT_ID = get_plane_project_id(PROJECT_NAME)
+PROJECT_ID = lazy(get_plane_project_id, PROJECT_NAME)
 ISSUE_NAME = 'Evaluate data throughput'
 ASSIGNEE_USERNAME = 'zhang_wei'
 
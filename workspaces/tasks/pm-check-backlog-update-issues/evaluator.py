@@ -4,11 +4,11 @@ import os
 from typing import List
 
 from scoring import Result, Checkpoint, bonus_for_completing_final
-from common import create_rocketchat_client, get_plane_project_id, get_plane_state_id_dict, get_plane_project_all_issues, check_rocketchat_message_posted, grader
+from common import lazy_rocketchat_client, get_plane_project_id, get_plane_state_id_dict, get_plane_project_all_issues, check_rocketchat_message_posted, grader
 from config import *
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 
 @grader
@@ -2,7 +2,7 @@ import json
 from typing import List
 
 from scoring import Result, Checkpoint, bonus_for_completing_any_of_given_checkpoints
-from common import get_plane_project_id, make_gitlab_request, grader
+from common import get_plane_project_id, lazy, make_gitlab_request, grader
 from config import GITLAB_USER
 
 CHECKPOINT_1_POINTS = 1
@@ -13,7 +13,7 @@ CHECKPOINT_4_POINTS = 1
 GITLAB_PROJECT_PATH = f"{GITLAB_USER}/janusgraph"
 
 PROJECT_NAME = "JanusGraph"
-PROJECT_ID = get_plane_project_id(PROJECT_NAME)
+PROJECT_ID = lazy(get_plane_project_id, PROJECT_NAME)
 TODO_ISSUE_1 = "Integrate algorithms into existing graph database"
 TODO_ISSUE_2 = "Implement optimization techniques for large datasets"
 NEW_ISSUE_1 = "Research and design new algorithms"
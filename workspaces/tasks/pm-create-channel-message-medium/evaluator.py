@@ -4,10 +4,10 @@ import logging
 from typing import List
 
 from scoring import Result, Checkpoint
-from common import get_rocketchat_channel_room_id, check_rocketchat_message_posted,create_rocketchat_client, grader
+from common import get_rocketchat_channel_room_id, check_rocketchat_message_posted,lazy_rocketchat_client, grader
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 
 def check_channel_exists(channel_name):
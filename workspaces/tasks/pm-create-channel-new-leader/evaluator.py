@@ -2,11 +2,11 @@
 from typing import List
 
 from scoring import Result, Checkpoint, bonus_for_completing_final
-from common import create_rocketchat_client, grader
+from common import lazy_rocketchat_client, grader
 
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def checkpoint1(trajectory):
@@ -1,10 +1,10 @@
 import logging
 from typing import List
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, get_rocketchat_channel_history, evaluate_with_llm, grader
+from common import lazy_rocketchat_client, get_rocketchat_channel_history, evaluate_with_llm, grader
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint1(trajectory):
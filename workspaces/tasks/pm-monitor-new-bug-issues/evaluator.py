@@ -1,12 +1,12 @@
 import logging
 from typing import List
 from scoring import Result, Checkpoint, bonus_for_completing_final
-from common import create_rocketchat_client, get_rocketchat_channel_history, grader
+from common import lazy_rocketchat_client, get_rocketchat_channel_history, grader
 from config import *
 
 ############################# Init Variables #####################################
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 
 
@@ -2,7 +2,7 @@ import os
 import pptx
 from typing import List
 from common import (
-    create_rocketchat_client,
+    lazy_rocketchat_client,
     get_rocketchat_personal_chat_history,
     get_all_texts_from_slide,
     grader
@@ -11,7 +11,7 @@ from scoring import Result, Checkpoint, bonus_for_completing_any
 import pandas as pd
 
 # Initialize RocketChat client
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 
 @grader
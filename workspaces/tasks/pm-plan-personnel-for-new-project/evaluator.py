@@ -8,11 +8,11 @@ from datetime import datetime
 from scoring import Result, Checkpoint, bonus_for_completing_final
 import logging
 
-from common import create_rocketchat_client, evaluate_chat_history_with_llm, get_rocketchat_personal_chat_history, grader
+from common import lazy_rocketchat_client, evaluate_chat_history_with_llm, get_rocketchat_personal_chat_history, grader
 
 ############################# Init Variables #####################################
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 REFERENCE_MONTH = 'february'
 
@@ -1,12 +1,12 @@
 import os
 import pptx
 from typing import List
-from common import create_rocketchat_client, get_all_texts_from_slide
+from common import lazy_rocketchat_client, get_all_texts_from_slide
 from common import get_rocketchat_personal_chat_history, grader
 from scoring import Result, Checkpoint, bonus_for_completing_any
 
 # Initialize RocketChat client
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 
 @grader
@@ -1,9 +1,9 @@
 import logging
 from scoring import Result, Checkpoint, bonus_for_completing_final
-from common import create_rocketchat_client, get_rocketchat_channel_history, grader
+from common import lazy_rocketchat_client, get_rocketchat_channel_history, grader
 
 # Initialize RocketChat client
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 # Define the expected URL and metrics
 PLANE_ANALYTICS_URL = "http://the-agent-company.com:8091/tac/analytics"
@@ -5,10 +5,10 @@ from typing import List
 
 from scoring import Result, Checkpoint
 from common import evaluate_with_llm
-from common import create_rocketchat_client, grader, get_rocketchat_personal_chat_history
+from common import lazy_rocketchat_client, grader, get_rocketchat_personal_chat_history
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 def check_final_result(file_path):
     # Check if the file exists
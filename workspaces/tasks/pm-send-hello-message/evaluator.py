@@ -4,10 +4,10 @@ import logging
 from typing import List
 
 from scoring import Result, Checkpoint, bonus_for_completing_any
-from common import create_rocketchat_client, grader
+from common import lazy_rocketchat_client, grader
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def check_url(trajectory):
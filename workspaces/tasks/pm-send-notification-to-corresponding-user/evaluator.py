@@ -1,13 +1,11 @@
 import os
 import logging
 
-from typing import List
-
-from scoring import Result, Checkpoint
-from common import create_rocketchat_client, grader, evaluate_chat_history_with_llm
+from scoring import run_checkpoints
+from common import lazy_rocketchat_client, grader, evaluate_chat_history_with_llm
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 predicate = 'there is a plan to hold a kickoff meeting for the main Q4 project'
 
 @grader
@@ -28,22 +26,13 @@ def grade_checkpoint4(username='Mark Johnson'):
 
 
 def grade_checkpoints(trajectory=""):
-    checkpoints: List[Checkpoint] = []
-    result = Result(checkpoints)
-
-    # Define the scores corresponding to when each function is True
-    scores = {
-        grade_checkpoint1: 1,
-        grade_checkpoint2: 1,
-        grade_checkpoint3: 1,
-        grade_checkpoint4: 1,
-
-    }
-
-    for func, total_score in scores.items():
-        checkpoints.append(Checkpoint(total_score, total_score * int(func())))
-
-    return result
+    # the chat histories are independent of each other, so they are evaluated concurrently
+    return run_checkpoints([
+        grade_checkpoint1,
+        grade_checkpoint2,
+        grade_checkpoint3,
+        grade_checkpoint4,
+    ])
 
 
 
@@ -2,7 +2,7 @@ import json
 from typing import List
 
 from scoring import Result, Checkpoint
-from common import get_plane_project_id, make_gitlab_request, grader
+from common import get_plane_project_id, lazy, make_gitlab_request, grader
 from config import GITLAB_USER
 from scoring import bonus_for_completing_final
 
@@ -12,7 +12,7 @@ CHECKPOINT_2_POINTS = 2
 GITLAB_PROJECT_PATH = f"{GITLAB_USER}/openhands"
 
 PROJECT_NAME = "OpenHands"
-PROJECT_ID = get_plane_project_id(PROJECT_NAME)
+PROJECT_ID = lazy(get_plane_project_id, PROJECT_NAME)
 ISSUE_1 = "Model: recall rate is 0"
 ISSUE_2 = "Model: security problem"
 
@@ -1,11 +1,11 @@
 import logging
 from config import GITLAB_USER
-from common import get_plane_project_id, make_gitlab_request
+from common import get_plane_project_id, lazy, make_gitlab_request
 
 GITLAB_PROJECT_PATH=f"{GITLAB_USER}/openhands"
 
 PLANE_PROJECT_NAME = "OpenHands"
-PLANE_PROJECT_ID = get_plane_project_id(PLANE_PROJECT_NAME)
+PLANE_PROJECT_ID = lazy(get_plane_project_id, PLANE_PROJECT_NAME)
 ISSUE_1 = "Model: recall rate is 0"
 ISSUE_2 = "Model: security problem"
 
@@ -2,7 +2,7 @@ import logging
 from typing import List
 
 from scoring import Result, Checkpoint
-from common import get_plane_issue_details, get_plane_state_details, get_plane_issues_by_project_cycle, get_plane_cycle_details, get_plane_project_id, make_gitlab_request, grader
+from common import get_plane_issue_details, get_plane_state_details, get_plane_issues_by_project_cycle, get_plane_cycle_details, get_plane_project_id, lazy, make_gitlab_request, grader
 from config import GITLAB_USER
 
 CHECKPOINT_1_POINTS = 1
@@ -14,7 +14,7 @@ CHECKPOINT_5_POINTS = 2
 GITLAB_PROJECT_PATH = f"{GITLAB_USER}/janusgraph"
 
 PROJECT_NAME = "JanusGraph"
-PROJECT_ID = get_plane_project_id(PROJECT_NAME)
+PROJECT_ID = lazy(get_plane_project_id, PROJECT_NAME)
 CYCLE_NAME = "Sprint 2"
 ISSUE_1 = "Improve Logging for Bulk Request Failures"
 ISSUE_2 = "Optimize Retry Mechanism for Out of Memory Errors"
@@ -1,11 +1,11 @@
 import logging
 from config import GITLAB_USER
-from common import create_plane_issue, get_plane_issue_details, get_plane_cycle_details, add_plane_issue_to_cycle, get_plane_project_id, make_gitlab_request
+from common import create_plane_issue, get_plane_issue_details, get_plane_cycle_details, add_plane_issue_to_cycle, get_plane_project_id, lazy, make_gitlab_request
 
 GITLAB_PROJECT_PATH=f"{GITLAB_USER}/janusgraph"
 
 PLANE_PROJECT_NAME = "JanusGraph"
-PLANE_PROJECT_ID = get_plane_project_id(PLANE_PROJECT_NAME)
+PLANE_PROJECT_ID = lazy(get_plane_project_id, PLANE_PROJECT_NAME)
 CYCLE_NAME = "Sprint 1"
 ISSUE_1 = "Improve Logging for Bulk Request Failures"
 ISSUE_2 = "Optimize Retry Mechanism for Out of Memory Errors"
@@ -6,9 +6,9 @@ from typing import List
 
 from scoring import Result, Checkpoint, bonus_for_completing_final
 from config import PLANE_BASEURL,PLANE_WORKSPACE_SLUG,PLANE_HEADERS
-from common import create_rocketchat_client, get_plane_project_id, get_plane_issues_by_project_cycle, grader
+from common import lazy_rocketchat_client, get_plane_project_id, get_plane_issues_by_project_cycle, grader
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 
 def get_rocketchat_channel_room_id(rocket_client, channel_name):
@@ -3,14 +3,14 @@ from typing import List
 from datetime import datetime
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, get_rocketchat_personal_chat_history, grader
+from common import lazy_rocketchat_client, get_rocketchat_personal_chat_history, grader
 
 
 SDE_NAME = "Zhang Wei"
 CTO_NAME = "Sarah Johnson"
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 
 @grader
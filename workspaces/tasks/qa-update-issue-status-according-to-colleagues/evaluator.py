@@ -3,7 +3,7 @@ from scoring import Result, Checkpoint
 from common import *
 from typing import List
 
-rocket=create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint1(trajectory):
@@ -4,7 +4,7 @@ from typing import List
 import re
 
 from scoring import Result, Checkpoint
-from common import make_gitlab_request, grader
+from common import make_gitlab_request, iter_gitlab, grader
 from config import GITLAB_USER, GITLAB_BASEURL
 
 CHECKPOINT_1_POINTS = 3
@@ -34,15 +34,11 @@ DESCRIPTIONS = {
 }
 
 def get_projects():
-    response = make_gitlab_request(None, 'projects')
-    if response is None or response.status_code != 200:
-        logging.error('Failed to fetch projects from GitLab')
-        return []
-    projects = response.json()
-    if projects is None:
-        logging.error('Failed to fetch projects from GitLab')
+    try:
+        return list(iter_gitlab('projects'))
+    except Exception as e:
+        logging.error(f'Failed to fetch projects from GitLab: {e}')
         return []
-    return projects
 
 def get_readme_content():
     # Get README.md content from 'doc' repository
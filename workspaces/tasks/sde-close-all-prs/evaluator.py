@@ -9,7 +9,7 @@ from common import *
 def grade_checkpoint1():
     try:
         # Get all projects
-        response = make_gitlab_request(additional_path="projects").json()
+        response = list(iter_gitlab("projects"))
 
         if len(response) == 0:
             logging.warning(f"All repositories are deleted.")
@@ -18,8 +18,8 @@ def grade_checkpoint1():
         for repo in response:
             repo_name = repo["name"]
             repo_id = str(repo["id"])
-            merge_requests = make_gitlab_request(project_identifier=repo_id, additional_path="merge_requests", params={"state": "opened"}).json()
-            if len(merge_requests) > 0:
+            # one open merge request is enough, so stop at the first one
+            if next(iter_gitlab(f"projects/{repo_id}/merge_requests", {"state": "opened"}), None) is not None:
                 logging.warning(f"Some PRs are not closed in repository {repo_name}.")
                 return False
 
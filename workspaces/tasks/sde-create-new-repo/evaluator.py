@@ -5,7 +5,7 @@ import urllib
 from typing import List
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client
+from common import lazy_rocketchat_client
 from common import make_gitlab_request
 from common import evaluate_with_llm
 from common import evaluate_chat_history_with_llm
@@ -18,7 +18,7 @@ project_path = "root/new-storage-project"
 readme_path = "README.md"
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 ############################# Helper Functions #####################################
 
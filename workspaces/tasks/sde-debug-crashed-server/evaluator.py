@@ -9,10 +9,10 @@ import requests
 from typing import List
 
 from scoring import Result, Checkpoint
-from common import create_rocketchat_client, grader, get_rocketchat_personal_chat_history
+from common import lazy_rocketchat_client, grader, get_rocketchat_personal_chat_history
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint1(content: list[str]):
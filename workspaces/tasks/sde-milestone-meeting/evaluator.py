@@ -4,12 +4,12 @@ from bs4 import BeautifulSoup
 from typing import List
 
 
-from common import create_rocketchat_client, grader
+from common import lazy_rocketchat_client, grader
 from scoring import Result, Checkpoint, bonus_for_completing_any
 
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint1(trajectory):
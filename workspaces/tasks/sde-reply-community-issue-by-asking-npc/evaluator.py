@@ -7,11 +7,11 @@ from typing import List
 from scoring import Result, Checkpoint
 from common import evaluate_with_llm
 from common import make_gitlab_request
-from common import create_rocketchat_client, grader
+from common import lazy_rocketchat_client, grader
 from common import get_rocketchat_personal_chat_history, evaluate_chat_history_with_llm
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 # Configuration for gitlab
 project_path = "root/openhands"
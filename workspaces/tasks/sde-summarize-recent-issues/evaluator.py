@@ -5,12 +5,12 @@ import sys
 
 from typing import List
 
-from common import create_rocketchat_client, grader
+from common import lazy_rocketchat_client, grader
 from scoring import Result, Checkpoint, bonus_for_completing_final
 
 
 # Create RocketChat instance
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint1(trajectory):
@@ -1,13 +1,13 @@
 from typing import List
 from scoring import Result, Checkpoint, bonus_for_completing_any
-from common import create_rocketchat_client, get_rocketchat_personal_chat_history, grader
+from common import lazy_rocketchat_client, get_rocketchat_personal_chat_history, grader
 import logging
 
 from packaging.requirements import Requirement
 from packaging.version import Version
 import re
 
-rocket = create_rocketchat_client()
+rocket = lazy_rocketchat_client()
 
 @grader
 def grade_checkpoint1(trajectory="") -> bool: